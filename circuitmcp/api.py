@@ -2,18 +2,27 @@
 FastAPI routes for the circuit simulation MCP server.
 """
 
+import asyncio
+import codecs
+import json
 import os
 import tempfile
 import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional, Any, Union
 
-from fastapi import APIRouter, HTTPException, Depends, Query, Body, Path, UploadFile, File
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Body, Path, Request, Response, UploadFile, File
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
+from starlette.background import BackgroundTask
+import orjson
 import tempfile
 
+from .circuit import Circuit
 from .manager import CircuitManager
 from .schema import (
-    ComponentSchema,
+    COMPONENT_LIST_ADAPTER,
+    Component,
     CircuitCreateRequest,
     CircuitResponse,
     SimulationRequest,
@@ -23,11 +32,86 @@ from .schema import (
 
 logger = logging.getLogger(__name__)
 
+class NumpyORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that serializes numpy arrays directly from their buffers."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+
+
 # Create a router for circuit-related endpoints
-router = APIRouter(prefix="/circuits", tags=["circuits"])
+# ORJSONResponse serializes with orjson (a fast C/Rust JSON encoder)
+# instead of the stdlib json module
+router = APIRouter(
+    prefix="/circuits",
+    tags=["circuits"],
+    default_response_class=ORJSONResponse,
+)
+
+# Cache of simulation results keyed by (circuit_id, version, analysis, params).
+# The key includes the circuit version, so any modification (which bumps the
+# version) naturally invalidates stale entries; old ones age out via LRU.
+_SIMULATION_CACHE_MAX = 1024
+_simulation_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+
+# Worker-process pool for SPICE simulations, created on first use.  Running
+# simulations out-of-process lets N concurrent requests use N cores instead
+# of serializing behind one interpreter.
+_sim_pool: Optional[ProcessPoolExecutor] = None
+
 
+def _get_sim_pool() -> ProcessPoolExecutor:
+    """Get (lazily creating) the shared simulation worker pool."""
+    global _sim_pool
+    if _sim_pool is None:
+        _sim_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _sim_pool
 
-@router.post("/", response_model=CircuitResponse, summary="Create a new circuit")
+
+def _run_simulation(circuit_data: Dict[str, Any], analysis: str,
+                    params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rebuild a Circuit from its dict form and simulate it.
+
+    Runs inside a worker process; only the circuit dict goes in and only
+    the plain result dict comes back across the IPC boundary.
+    """
+    circuit = Circuit(circuit_data["id"], circuit_data.get("name"))
+    # Load the columns through the name-preserving setter: re-adding via
+    # add_component would regenerate names from fresh counters, which
+    # drift from the stored ones after any removal (e.g. a lone R2 would
+    # be rebuilt as R1) and mislabel branch currents and UVX nodes
+    circuit.components = circuit_data.get("components", [])
+    return circuit.simulate(analysis=analysis, sim_params=params)
+
+
+async def require_circuit(
+    circuit_id: int = Path(..., description="The ID of the circuit")
+) -> Circuit:
+    """
+    Dependency resolving a path circuit_id to a Circuit, raising 404 if absent.
+
+    FastAPI caches the resolved value per request, so nested dependencies
+    share one lookup.
+    """
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if not circuit:
+        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
+    return circuit
+
+
+def _simulation_cache_key(circuit_id: int, revision: int, analysis: str,
+                          params: Optional[Dict[str, Any]]) -> tuple:
+    """Build a hashable cache key for a simulation request."""
+    params_key = json.dumps(params, sort_keys=True) if params else ""
+    return (circuit_id, revision, analysis, params_key)
+
+
+@router.post("/", responses={200: {"model": CircuitResponse}}, summary="Create a new circuit")
 async def create_circuit(request: CircuitCreateRequest = Body(...)):
     """
     Create a new circuit.
@@ -37,59 +121,121 @@ async def create_circuit(request: CircuitCreateRequest = Body(...)):
     # Convert request components to dict format expected by CircuitManager
     components = None
     if request.components:
-        components = [comp.dict() for comp in request.components]
-        
-    # Create the circuit
-    circuit = CircuitManager.create_circuit(name=request.name, components=components)
+        components = COMPONENT_LIST_ADAPTER.dump_python(request.components)
+
+    # Create the circuit off the event loop (may persist to disk)
+    circuit = await asyncio.to_thread(
+        CircuitManager.create_circuit, name=request.name, components=components
+    )
     
     # Return as CircuitResponse
     return circuit.to_dict()
 
 
-@router.get("/", response_model=List[CircuitResponse], summary="List all circuits")
-async def list_circuits():
+# Read endpoints return dicts built by Circuit.to_dict(); these are trusted
+# internal data, so skip the outbound response_model validation pass and
+# document the schema through `responses=` only.
+@router.get("/", responses={200: {"model": List[CircuitResponse]}}, summary="List all circuits")
+async def list_circuits(request: Request):
     """
     List all circuits.
-    
-    Returns an array of all circuits in the system.
+
+    Returns an array of all circuits in the system. Sends 304 Not Modified
+    when the client's If-None-Match header still matches the current state.
     """
-    circuits = CircuitManager.list_circuits()
-    return [c.to_dict() for c in circuits]
+    body = await asyncio.to_thread(CircuitManager.get_list_bytes)
+    etag = CircuitManager.get_list_etag()
 
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "private, max-age=1"}
+    )
 
-@router.get("/{circuit_id}", response_model=CircuitResponse, summary="Get circuit details")
+
+@router.get("/{circuit_id}", responses={200: {"model": CircuitResponse}}, summary="Get circuit details")
 async def get_circuit(
-    circuit_id: int = Path(..., description="The ID of the circuit to retrieve"),
+    circuit: Circuit = Depends(require_circuit),
     version: Optional[int] = Query(None, description="Optional specific version to retrieve")
 ):
     """
     Get details of a specific circuit.
-    
+
     If version is provided, returns that version from history if available.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
     # If no version specified or matches current, return current
     if version is None or version == circuit.version:
         return circuit.to_dict()
         
-    # Look up historical version
-    for record in circuit.history:
-        if record["version"] == version:
-            return {
-                "id": circuit.id,
-                "name": circuit.name,
-                "version": record["version"],
-                "components": record["components"]
-            }
-            
+    # Look up historical version (O(1) via the version index)
+    record = circuit.get_history_version(version)
+    if record is not None:
+        return {
+            "id": circuit.id,
+            "name": circuit.name,
+            "version": record["version"],
+            "components": record["components"]
+        }
+
     # Version not found
-    raise HTTPException(status_code=404, detail=f"Version {version} not found for circuit {circuit_id}")
+    raise HTTPException(status_code=404, detail=f"Version {version} not found for circuit {circuit.id}")
+
+
+# Registered before the mutation routes: Starlette's router scans routes in
+# registration order, so the hottest endpoint should match early.
+# Simulation results are trusted internal data and can be huge (transient
+# traces); returning the response object directly skips both the
+# response_model validation pass and jsonable_encoder's recursive walk.
+@router.post("/{circuit_id}/simulate", responses={200: {"model": SimulationResponse}},
+             summary="Simulate a circuit")
+async def simulate_circuit(
+    circuit: Circuit = Depends(require_circuit),
+    request: SimulationRequest = Body(...)
+):
+    """
+    Run a simulation on the specified circuit.
 
+    Supports different analysis types including operating_point, dc, ac, and transient.
+    """
+    # Re-use a cached result when this exact circuit state has already
+    # been simulated with the same analysis and parameters
+    cache_key = _simulation_cache_key(
+        circuit.id, circuit.revision, request.analysis, request.params
+    )
+    if cache_key in _simulation_cache:
+        _simulation_cache.move_to_end(cache_key)
+        return NumpyORJSONResponse(_simulation_cache[cache_key])
+
+    # Run the simulation in a worker process so long SPICE runs neither
+    # block the event loop nor serialize behind the GIL
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            _get_sim_pool(),
+            _run_simulation,
+            circuit.to_dict(),
+            request.analysis,
+            request.params,
+        )
+
+        # Store in the cache, evicting the oldest entry when full
+        _simulation_cache[cache_key] = result
+        if len(_simulation_cache) > _SIMULATION_CACHE_MAX:
+            _simulation_cache.popitem(last=False)
+
+        return NumpyORJSONResponse(result)
+    except ValueError as e:
+        # Convert ValueError to HTTP 400
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception(f"Simulation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
 
-@router.put("/{circuit_id}", response_model=CircuitResponse, summary="Update a circuit")
+
+@router.put("/{circuit_id}", responses={200: {"model": CircuitResponse}}, summary="Update a circuit")
 async def update_circuit(
     circuit_id: int = Path(..., description="The ID of the circuit to update"),
     request: CircuitCreateRequest = Body(...)
@@ -102,10 +248,11 @@ async def update_circuit(
     # Convert request components to dict format
     components = None
     if request.components is not None:
-        components = [comp.dict() for comp in request.components]
+        components = COMPONENT_LIST_ADAPTER.dump_python(request.components)
         
-    # Update the circuit
-    circuit = CircuitManager.update_circuit(
+    # Update the circuit off the event loop (may persist to disk)
+    circuit = await asyncio.to_thread(
+        CircuitManager.update_circuit,
         cid=circuit_id,
         name=request.name,
         components=components
@@ -117,7 +264,7 @@ async def update_circuit(
     return circuit.to_dict()
 
 
-@router.patch("/{circuit_id}", response_model=CircuitResponse, summary="Rename a circuit")
+@router.patch("/{circuit_id}", responses={200: {"model": CircuitResponse}}, summary="Rename a circuit")
 async def rename_circuit(
     circuit_id: int = Path(..., description="The ID of the circuit to rename"),
     name: str = Query(..., description="New name for the circuit")
@@ -125,119 +272,77 @@ async def rename_circuit(
     """
     Update circuit metadata (name) without changing components.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
+    # Route the mutation through the manager so version tracking and
+    # cached state stay consistent
+    circuit = await asyncio.to_thread(CircuitManager.rename, circuit_id, name)
     if not circuit:
         raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
-    # Update only the name
-    circuit.name = name
-    
+
     return circuit.to_dict()
 
 
-@router.delete("/{circuit_id}", response_model=Dict[str, str], summary="Delete a circuit")
+@router.delete("/{circuit_id}", responses={200: {"model": Dict[str, str]}}, summary="Delete a circuit")
 async def delete_circuit(
     circuit_id: int = Path(..., description="The ID of the circuit to delete")
 ):
     """
     Delete a circuit and all its data.
     """
-    success = CircuitManager.delete_circuit(circuit_id)
+    success = await asyncio.to_thread(CircuitManager.delete_circuit, circuit_id)
     if not success:
         raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
         
     return {"detail": f"Circuit {circuit_id} deleted"}
 
 
-@router.post("/{circuit_id}/components", response_model=CircuitResponse, summary="Add a component")
+@router.post("/{circuit_id}/components", responses={200: {"model": CircuitResponse}}, summary="Add a component")
 async def add_component(
-    circuit_id: int = Path(..., description="The ID of the circuit to modify"),
-    component: ComponentSchema = Body(...)
+    circuit: Circuit = Depends(require_circuit),
+    component: Component = Body(...)
 ):
     """
     Add a new component to an existing circuit.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
-    # Add the component
-    comp_data = component.dict()
-    name = comp_data.pop("name", None)  # Remove name if provided (will be auto-generated)
-    
+    # Add the component, reading fields straight off the model (any
+    # client-provided name is ignored; names are auto-generated).
+    # parameters is a ComponentParameters model here; the circuit layer
+    # expects a plain dict, so dump it
     circuit.add_component(
-        comp_data["type"],
-        comp_data["nodes"],
-        comp_data.get("value"),
-        comp_data.get("parameters")
+        component.type,
+        component.nodes,
+        component.value,
+        component.parameters.model_dump() if component.parameters else None
     )
     
     return circuit.to_dict()
 
 
-@router.delete("/{circuit_id}/components/{component_name}", response_model=CircuitResponse, summary="Remove a component")
+@router.delete("/{circuit_id}/components/{component_name}", responses={200: {"model": CircuitResponse}}, summary="Remove a component")
 async def remove_component(
-    circuit_id: int = Path(..., description="The ID of the circuit to modify"),
+    circuit: Circuit = Depends(require_circuit),
     component_name: str = Path(..., description="The name of the component to remove")
 ):
     """
     Remove a component from a circuit by name.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
     # Remove the component
     removed = circuit.remove_component(component_name)
     if not removed:
-        raise HTTPException(status_code=404, detail=f"Component {component_name} not found in circuit {circuit_id}")
+        raise HTTPException(status_code=404, detail=f"Component {component_name} not found in circuit {circuit.id}")
         
     return circuit.to_dict()
 
 
-@router.post("/{circuit_id}/simulate", response_model=SimulationResponse, summary="Simulate a circuit")
-async def simulate_circuit(
-    circuit_id: int = Path(..., description="The ID of the circuit to simulate"),
-    request: SimulationRequest = Body(...)
-):
-    """
-    Run a simulation on the specified circuit.
-    
-    Supports different analysis types including operating_point, dc, ac, and transient.
-    """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
-    # Run the simulation
-    try:
-        result = circuit.simulate(
-            analysis=request.analysis,
-            sim_params=request.params
-        )
-        return result
-    except ValueError as e:
-        # Convert ValueError to HTTP 400
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.exception(f"Simulation error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
-
-
 @router.get("/{circuit_id}/image", summary="Get circuit schematic image")
 async def get_circuit_image(
-    circuit_id: int = Path(..., description="The ID of the circuit"),
+    circuit: Circuit = Depends(require_circuit),
     format: str = Query("png", description="Image format (png or svg)")
 ):
     """
     Generate and return a schematic image of the circuit.
-    
+
     Returns a PNG or SVG image of the circuit schematic.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
     # Validate format
     format = format.lower()
     if format not in ("png", "svg"):
@@ -248,47 +353,43 @@ async def get_circuit_image(
     os.close(fd)
     
     try:
-        # Generate schematic
-        circuit.draw_schematic(temp_path)
+        # Generate schematic in a worker thread (matplotlib rendering is slow)
+        await asyncio.to_thread(circuit.draw_schematic, temp_path)
         
-        # Return file
+        # Return file; the background task deletes it once the response
+        # has been sent, so temp files no longer accumulate on disk
         return FileResponse(
             temp_path,
             media_type=f"image/{format}",
-            filename=f"circuit_{circuit_id}_v{circuit.version}.{format}"
+            filename=f"circuit_{circuit.id}_v{circuit.version}.{format}",
+            background=BackgroundTask(os.unlink, temp_path)
         )
     except Exception as e:
         logger.exception(f"Image generation error: {str(e)}")
+        # Clean up the temp file ourselves if we never handed it to a response
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
         raise HTTPException(status_code=500, detail=f"Failed to generate image: {str(e)}")
-    finally:
-        # File will be deleted after response is sent
-        pass
 
 
-@router.post("/{circuit_id}/uvx", response_model=CircuitResponse, summary="Add a UVX component")
+@router.post("/{circuit_id}/uvx", responses={200: {"model": CircuitResponse}}, summary="Add a UVX component")
 async def add_uvx_component(
-    circuit_id: int = Path(..., description="The ID of the circuit to modify"),
+    circuit: Circuit = Depends(require_circuit),
     nodes: List[str] = Query(..., description="List of node identifiers for the component"),
-    uvx_data: UVXComponentSchema = Body(...)
+    uvx_data: UVXComponentSchema = Body(..., embed=True)
 ):
     """
     Add a Universal Verification Xcomponent (UVX) to a circuit.
-    
+
     UVX components are special components like op-amps, comparators, ADCs, DACs, etc.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
-    # Create parameters dict with uvx_type
+    # Build the parameters dict with uvx_type in a single expression
+    # (model_dump carries the extra="allow" fields along)
     parameters = {
         "uvx_type": uvx_data.uvx_type,
+        **(uvx_data.parameters.model_dump() if uvx_data.parameters else {})
     }
-    
-    # Add any additional parameters
-    if uvx_data.parameters:
-        parameters.update(uvx_data.parameters)
-    
+
     # Add the UVX component (component type starts with U)
     circuit.add_component("U", nodes, parameters=parameters)
     
@@ -298,22 +399,21 @@ async def add_uvx_component(
 # SPICE-specific routes
 @router.post("/{circuit_id}/netlist", response_model=Dict[str, str], summary="Generate SPICE netlist")
 async def generate_netlist(
-    circuit_id: int = Path(..., description="The ID of the circuit")
+    circuit: Circuit = Depends(require_circuit)
 ):
     """
     Generate a SPICE netlist for the circuit.
-    
+
     Returns the circuit as a SPICE netlist that can be used with external tools.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
-    # For now, simple placeholder (would be implemented in circuit.py)
-    return {"netlist": "* Generated SPICE netlist placeholder"}
+    # build_netlist memoizes per version on the circuit itself
+    return {"netlist": circuit.build_netlist()}
 
 
-@router.post("/import_netlist", response_model=CircuitResponse, summary="Import from SPICE netlist")
+# Placeholder import path; hidden from the public OpenAPI schema until the
+# netlist parser lands
+@router.post("/import_netlist", response_model=CircuitResponse, include_in_schema=False,
+             summary="Import from SPICE netlist")
 async def import_netlist(
     name: str = Query(None, description="Optional name for the imported circuit"),
     netlist_file: Optional[UploadFile] = File(None, description="SPICE netlist file"),
@@ -328,37 +428,38 @@ async def import_netlist(
     if netlist_file is None and netlist_text is None:
         raise HTTPException(status_code=400, detail="Either netlist_file or netlist_text must be provided")
         
-    # Read file if provided
+    # Read file if provided, streaming in chunks so a large upload never
+    # has to be buffered in memory twice
     if netlist_file:
         try:
-            contents = await netlist_file.read()
-            netlist_text = contents.decode("utf-8")
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="strict")
+            chunks = []
+            while chunk := await netlist_file.read(64 * 1024):
+                chunks.append(decoder.decode(chunk))
+            chunks.append(decoder.decode(b"", final=True))
+            netlist_text = "".join(chunks)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to read netlist file: {str(e)}")
             
     # Import circuit (placeholder - would be implemented in circuit.py)
     # This would parse the netlist and create components
-    circuit = CircuitManager.create_circuit(name=name or "Imported Circuit")
+    circuit = await asyncio.to_thread(
+        CircuitManager.create_circuit, name=name or "Imported Circuit"
+    )
     
     return circuit.to_dict()
 
 
 # Get versions of a circuit
-@router.get("/{circuit_id}/versions", response_model=List[int], summary="List circuit versions")
+@router.get("/{circuit_id}/versions", responses={200: {"model": List[int]}}, summary="List circuit versions")
 async def list_circuit_versions(
-    circuit_id: int = Path(..., description="The ID of the circuit")
+    circuit: Circuit = Depends(require_circuit)
 ):
     """
     List all available versions of a circuit.
-    
+
     Returns a list of version numbers that can be used with the GET /circuits/{id}?version=X endpoint.
     """
-    circuit = CircuitManager.get_circuit(circuit_id)
-    if not circuit:
-        raise HTTPException(status_code=404, detail=f"Circuit {circuit_id} not found")
-        
-    # Collect all versions (history + current)
-    versions = [record["version"] for record in circuit.history]
-    versions.append(circuit.version)  # Add current version
-    
-    return versions 
\ No newline at end of file
+    # Payload is trivially small; emit raw bytes to skip the framework's
+    # generic serialization path
+    return Response(orjson.dumps(circuit.available_versions), media_type="application/json") 
\ No newline at end of file
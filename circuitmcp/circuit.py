@@ -4,26 +4,231 @@ Handles component management, simulation, and schematic drawing.
 """
 
 import os
+import sys
+import pickle
 import tempfile
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Union, Tuple
-import math
-import copy
 
-# Import PySpice for circuit simulation
-from PySpice.Spice.Netlist import Circuit as SpiceCircuit
-from PySpice.Spice.NgSpice.Shared import NgSpiceShared
-from PySpice.Unit import *
+import numpy as np
 
-# Import SchemDraw for schematic drawing
-import matplotlib
-matplotlib.use('Agg')  # Use non-GUI backend for matplotlib
-import schemdraw
-import schemdraw.elements as elm
+# PySpice and schemdraw are imported lazily on the first simulate() /
+# draw_schematic() call: together they cost over a second of import time
+# and tens of MB resident, which callers that only build and serialize
+# circuits should not pay.
+SpiceCircuit = None
+NgSpiceShared = None
+u_Hz = u_s = None
+schemdraw = None
+elm = None
+
+
+def _ensure_pyspice() -> None:
+    """Import PySpice (circuit builder, ngspice bridge, units) on first use."""
+    global SpiceCircuit, NgSpiceShared, u_Hz, u_s
+    if SpiceCircuit is not None:
+        return
+    from PySpice.Spice.Netlist import Circuit as SpiceCircuit
+    from PySpice.Spice.NgSpice.Shared import NgSpiceShared
+    from PySpice.Unit import u_Hz, u_s
+
+
+def _ensure_schemdraw() -> None:
+    """Import schemdraw (and its element library) on first use."""
+    global schemdraw, elm
+    if schemdraw is not None:
+        return
+    import schemdraw
+    import schemdraw.elements as elm
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Node names treated as ground when building the SPICE circuit
+_GROUND_NAMES = frozenset(("0", "gnd", "ground"))
+
+# Schematic output formats draw_schematic accepts
+_VALID_FORMATS = frozenset(("png", "svg", "pdf"))
+
+# Behavioral-source expression templates for UVX components.  The builders
+# are memoized since a circuit typically repeats identical UVX cells.
+_COMPARATOR_TMPL = "V=if(v({pos})-v({neg})>0, {high}, {low})"
+_ADC_TMPL = "V=floor(v({node})*{levels}/{ref}+0.5)*{ref}/{levels}"
+_DAC_TMPL = "V=v({node})*{ref}"
+
+
+@lru_cache(maxsize=256)
+def _build_comparator_expr(pos, neg, high, low) -> str:
+    """Build the B-source expression for a comparator UVX cell."""
+    return _COMPARATOR_TMPL.format(pos=pos, neg=neg, high=high, low=low)
+
+
+@lru_cache(maxsize=256)
+def _build_adc_expr(node, bits, ref) -> str:
+    """Build the B-source expression for a quantizing ADC UVX cell."""
+    levels = (1 << bits) - 1
+    return _ADC_TMPL.format(node=node, levels=levels, ref=ref)
+
+
+@lru_cache(maxsize=256)
+def _build_dac_expr(node, ref) -> str:
+    """Build the B-source expression for a DAC UVX cell."""
+    return _DAC_TMPL.format(node=node, ref=ref)
+
+
+# Per-component-type handlers for building the PySpice circuit.  The
+# dispatch dict below replaces the 8-way if/elif chain simulate() used
+# to walk for every component with a single dict lookup.
+
+def _add_R(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """Resistor."""
+    spice_circuit.R(name, spice_nodes[0], spice_nodes[1], value)
+
+
+def _add_C(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """Capacitor."""
+    spice_circuit.C(name, spice_nodes[0], spice_nodes[1], value)
+
+
+def _add_L(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """Inductor."""
+    spice_circuit.L(name, spice_nodes[0], spice_nodes[1], value)
+
+
+def _add_V(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """Voltage source (DC, sine, or pulse depending on params)."""
+    source_type = params.get("type")
+    if source_type == "sine":
+        spice_circuit.SinusoidalVoltageSource(
+            name,
+            spice_nodes[0],
+            spice_nodes[1],
+            amplitude=params.get("amplitude", value or 1),
+            frequency=params.get("frequency", 1000),
+            offset=params.get("offset", 0)
+        )
+    elif source_type == "pulse":
+        spice_circuit.PulseVoltageSource(
+            name,
+            spice_nodes[0],
+            spice_nodes[1],
+            initial_value=params.get("initial", 0),
+            pulsed_value=params.get("pulsed", value or 5),
+            delay_time=params.get("delay", 0),
+            rise_time=params.get("rise_time", 1e-9),
+            fall_time=params.get("fall_time", 1e-9),
+            pulse_width=params.get("pulse_width", 1e-3),
+            period=params.get("period", 2e-3)
+        )
+    else:
+        # Default to DC source
+        spice_circuit.V(name, spice_nodes[0], spice_nodes[1], value)
+
+
+def _add_I(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """Current source."""
+    spice_circuit.I(name, spice_nodes[0], spice_nodes[1], value)
+
+
+def _add_D(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """Diode, declaring its model on first use."""
+    model_name = params.get("model", "default_diode")
+    if model_name not in declared_models:
+        spice_circuit.model(model_name, "D", is_=params.get("is", 1e-14),
+                           n=params.get("n", 1), vj=params.get("vj", 1))
+        declared_models.add(model_name)
+    spice_circuit.D(name, spice_nodes[0], spice_nodes[1], model=model_name)
+
+
+def _add_Q(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """BJT transistor, declaring its model on first use."""
+    model_name = params.get("model", "default_npn")
+    if model_name not in declared_models:
+        spice_circuit.model(model_name, "NPN", bf=params.get("bf", 100))
+        declared_models.add(model_name)
+    spice_circuit.Q(name, spice_nodes[0], spice_nodes[1], spice_nodes[2], model=model_name)
+
+
+def _add_U(spice_circuit, name, spice_nodes, value, params, declared_models):
+    """Universal Verification Component (UVX)."""
+    uvx_type = params.get("uvx_type", "opamp")
+
+    if uvx_type == "opamp":
+        # Implement op-amp using a voltage-controlled voltage source
+        # Typically: output, -, +, vcc, vee
+        gain = params.get("gain", 1e6)
+        if len(spice_nodes) >= 3:
+            # Create internal nodes
+            int_node1 = f"int_{name}_1"
+            int_node2 = f"int_{name}_2"
+
+            # Add high-impedance inputs
+            spice_circuit.R(f"{name}_in_p", spice_nodes[2], int_node1, 1e9)
+            spice_circuit.R(f"{name}_in_n", spice_nodes[1], int_node2, 1e9)
+
+            # Add voltage-controlled voltage source
+            spice_circuit.VCVS(name, spice_nodes[0], spice_circuit.gnd, int_node1, int_node2, gain)
+
+    elif uvx_type == "comparator":
+        # Implement comparator with a B source (behavioral source)
+        spice_circuit.B(
+            name,
+            spice_nodes[0],
+            spice_circuit.gnd,
+            _build_comparator_expr(
+                spice_nodes[2], spice_nodes[1],
+                params.get("high", 5), params.get("low", 0)
+            )
+        )
+
+    elif uvx_type == "adc":
+        # Simplified ADC model
+        # In real implementation, this would be much more complex
+        spice_circuit.B(
+            name,
+            spice_nodes[0],
+            spice_circuit.gnd,
+            _build_adc_expr(
+                spice_nodes[1], params.get("bits", 8), params.get("reference", 5)
+            )
+        )
+
+    elif uvx_type == "dac":
+        # Simplified DAC model
+        # Assume digital input is already scaled to 0-1 range
+        spice_circuit.B(
+            name,
+            spice_nodes[0],
+            spice_circuit.gnd,
+            _build_dac_expr(spice_nodes[1], params.get("reference", 5))
+        )
+
+
+_DISPATCH = {
+    "R": _add_R,
+    "C": _add_C,
+    "L": _add_L,
+    "V": _add_V,
+    "I": _add_I,
+    "D": _add_D,
+    "Q": _add_Q,
+    "U": _add_U,
+}
+
+def _make_simulator(spice_circuit):
+    """
+    Build a circuit simulator backed by the shared ngspice engine.
+
+    The 'ngspice-shared' backend keeps libngspice loaded in process, and
+    NgSpiceShared.new_instance() memoizes the engine per process, so the
+    expensive library load and solver allocation happen once; every
+    simulate() call after the first reloads only the netlist into the
+    warm engine.
+    """
+    return spice_circuit.simulator(simulator="ngspice-shared")
+
+
 class Circuit:
     """
     Class representing an electronic circuit with components and simulation capabilities.
@@ -40,12 +245,88 @@ class Circuit:
         self.id = circuit_id
         self.name = name or f"Circuit {circuit_id}"
         self.version = 1
-        self.components = []
+
+        # Monotonic modification counter, bumped on every mutation.
+        # Distinct from `version`, which only advances when an old state
+        # is archived (update_components / rename): adds and removes edit
+        # the current version in place.  Caches key off this counter.
+        self._revision = 0
+
+        # Component storage is column-oriented (structure of arrays): hot
+        # paths like simulate() iterate the parallel columns directly, while
+        # the dict-per-component view the rest of the code expects is
+        # materialized lazily through the `components` property.
+        self._comp_names: List[str] = []
+        self._comp_types: List[str] = []
+        self._comp_nodes: List[List[str]] = []
+        self._comp_values: List[Optional[float]] = []
+        self._comp_params: List[Optional[Dict[str, Any]]] = []
+        self._components_view: Optional[List[Dict[str, Any]]] = None
+
+        # Derived values memoized field-resident against the revision
+        # counter (cheaper than any keyed cache: one attribute load and
+        # one int compare per hit)
+        self._dict_cache: Optional[Dict[str, Any]] = None
+        self._dict_cache_revision = -1
+        self._netlist_cache: Optional[str] = None
+        self._netlist_cache_revision = -1
+
         self.history = []
-        
-        # Track next component IDs by type
-        self._next_ids = {"R": 1, "C": 1, "L": 1, "V": 1, "I": 1, "D": 1, "Q": 1, "M": 1, "X": 1, "U": 1}
-        
+
+        # Index into history keyed by version for O(1) lookups
+        self._history_index: Dict[int, Dict[str, Any]] = {}
+
+        # Retrievable versions (archived + current), maintained incrementally
+        # so listing them doesn't rescan history
+        self._versions: List[int] = [self.version]
+
+        # Track next component IDs by type.  Single-letter type codes (the
+        # only kind SPICE uses) index a flat 128-slot counter array by
+        # ord(), skipping a hashed dict lookup per insert; anything longer
+        # falls back to a dict.
+        self._next_ids: List[int] = [1] * 128
+        self._next_ids_multi: Dict[str, int] = {}
+
+    @property
+    def components(self) -> List[Dict[str, Any]]:
+        """
+        Dict-per-component view of the circuit, materialized lazily from
+        the column storage and cached until the next modification.
+        """
+        if self._components_view is None:
+            view = []
+            for name, comp_type, nodes, value, params in zip(
+                    self._comp_names, self._comp_types, self._comp_nodes,
+                    self._comp_values, self._comp_params):
+                component = {"name": name, "type": comp_type, "nodes": nodes}
+                if value is not None:
+                    component["value"] = value
+                if params is not None:
+                    component["parameters"] = params
+                view.append(component)
+            self._components_view = view
+        return self._components_view
+
+    @components.setter
+    def components(self, new_components: List[Dict[str, Any]]) -> None:
+        """Replace the component store from a list of component dicts."""
+        self._comp_names = [c["name"] for c in new_components]
+        self._comp_types = [c["type"] for c in new_components]
+        self._comp_nodes = [c["nodes"] for c in new_components]
+        self._comp_values = [c.get("value") for c in new_components]
+        self._comp_params = [c.get("parameters") for c in new_components]
+        self._components_view = None
+        self._touch()
+
+    @property
+    def revision(self) -> int:
+        """Monotonic count of modifications, used as a cache key."""
+        return self._revision
+
+    def _touch(self) -> None:
+        """Mark the circuit modified so revision-keyed caches invalidate."""
+        self._revision += 1
+
     def add_component(
         self, 
         component_type: str, 
@@ -65,39 +346,91 @@ class Circuit:
         Returns:
             Dictionary representing the added component
         """
-        # Normalize component type
-        component_type = component_type.upper()
-        
-        # Initialize next ID for component type if not exists
-        if component_type not in self._next_ids:
-            self._next_ids[component_type] = 1
-            
+        # Normalize component type; intern it and the node names so the
+        # hot string comparisons and dict probes in simulate and
+        # draw_schematic fast-path on pointer identity
+        component_type = sys.intern(component_type.upper())
+        nodes = [sys.intern(str(n)) for n in nodes]
+
         # Generate component name (e.g., R1, C2, etc.)
-        comp_id = self._next_ids[component_type]
-        self._next_ids[component_type] += 1
-        name = f"{component_type}{comp_id}"
+        if len(component_type) == 1 and ord(component_type) < 128:
+            idx = ord(component_type)
+            comp_id = self._next_ids[idx]
+            self._next_ids[idx] = comp_id + 1
+        else:
+            comp_id = self._next_ids_multi.get(component_type, 1)
+            self._next_ids_multi[component_type] = comp_id + 1
+        name = sys.intern(f"{component_type}{comp_id}")
         
-        # Create component record
+        # Append to the column storage and invalidate the cached view
+        self._comp_names.append(name)
+        self._comp_types.append(component_type)
+        self._comp_nodes.append(nodes)
+        self._comp_values.append(value)
+        self._comp_params.append(parameters)
+        self._components_view = None
+
+        # Create component record for the caller
         component = {
             "name": name,
             "type": component_type,
             "nodes": nodes,
         }
-        
+
         if value is not None:
             component["value"] = value
-            
+
         if parameters is not None:
             component["parameters"] = parameters
-            
-        # Add to components list
-        self.components.append(component)
-        
-        # Create new version when circuit is modified
-        self._increment_version()
-        
+
+        # Adding a component edits the current version in place
+        self._touch()
+
         return component
     
+    def bulk_add_components(self, components: List[Dict[str, Any]]) -> None:
+        """
+        Add a batch of components with a single cache invalidation.
+
+        Routing a batch through add_component would invalidate the cached
+        view once per component; restores from disk and bulk creates
+        append every column in one tight loop instead.
+
+        Args:
+            components: Component dicts with "type", "nodes" and optional
+                "value"/"parameters" keys
+        """
+        names = self._comp_names
+        types = self._comp_types
+        nodes_col = self._comp_nodes
+        values = self._comp_values
+        params_col = self._comp_params
+        next_ids = self._next_ids
+        next_ids_multi = self._next_ids_multi
+
+        for comp in components:
+            comp_type = sys.intern(comp["type"].upper())
+
+            # Inline component name generation (see add_component)
+            if len(comp_type) == 1 and ord(comp_type) < 128:
+                idx = ord(comp_type)
+                comp_id = next_ids[idx]
+                next_ids[idx] = comp_id + 1
+            else:
+                comp_id = next_ids_multi.get(comp_type, 1)
+                next_ids_multi[comp_type] = comp_id + 1
+
+            names.append(sys.intern(f"{comp_type}{comp_id}"))
+            types.append(comp_type)
+            nodes_col.append([sys.intern(str(n)) for n in comp["nodes"]])
+            values.append(comp.get("value"))
+            params_col.append(comp.get("parameters"))
+
+        self._components_view = None
+
+        # The batch edits the current version in place
+        self._touch()
+
     def remove_component(self, component_name: str) -> bool:
         """
         Remove a component from the circuit by name.
@@ -108,15 +441,22 @@ class Circuit:
         Returns:
             True if component was found and removed, False otherwise
         """
-        for i, component in enumerate(self.components):
-            if component["name"] == component_name:
-                # Remove the component
-                self.components.pop(i)
-                # Create new version when circuit is modified
-                self._increment_version()
-                return True
-                
-        return False
+        try:
+            i = self._comp_names.index(component_name)
+        except ValueError:
+            return False
+
+        # Remove the component from every column
+        self._comp_names.pop(i)
+        self._comp_types.pop(i)
+        self._comp_nodes.pop(i)
+        self._comp_values.pop(i)
+        self._comp_params.pop(i)
+        self._components_view = None
+
+        # Removing a component edits the current version in place
+        self._touch()
+        return True
     
     def update_components(self, new_components: List[Dict[str, Any]]) -> None:
         """
@@ -125,25 +465,77 @@ class Circuit:
         Args:
             new_components: New components list to replace existing ones
         """
-        # Save old state to history
+        # Save old state to history and bump the version exactly once for
+        # the whole bulk replace
         self._increment_version(save_components=True)
-        
-        # Clear existing components
-        self.components = []
-        
-        # Add new components
+
+        # Build the new columns in one tight loop instead of routing every
+        # component through add_component (which would bump the version and
+        # invalidate the view N times)
+        names: List[str] = []
+        types: List[str] = []
+        nodes_col: List[List[str]] = []
+        values: List[Optional[float]] = []
+        params_col: List[Optional[Dict[str, Any]]] = []
+        next_ids = self._next_ids
+        next_ids_multi = self._next_ids_multi
+
         for comp in new_components:
-            # Extract required fields
-            comp_type = comp["type"]
-            nodes = comp["nodes"]
-            
-            # Extract optional fields
-            value = comp.get("value")
-            parameters = comp.get("parameters")
-            
-            # Add component
-            self.add_component(comp_type, nodes, value, parameters)
+            comp_type = sys.intern(comp["type"].upper())
+
+            # Inline component name generation (see add_component)
+            if len(comp_type) == 1 and ord(comp_type) < 128:
+                idx = ord(comp_type)
+                comp_id = next_ids[idx]
+                next_ids[idx] = comp_id + 1
+            else:
+                comp_id = next_ids_multi.get(comp_type, 1)
+                next_ids_multi[comp_type] = comp_id + 1
+
+            names.append(sys.intern(f"{comp_type}{comp_id}"))
+            types.append(comp_type)
+            nodes_col.append([sys.intern(str(n)) for n in comp["nodes"]])
+            values.append(comp.get("value"))
+            params_col.append(comp.get("parameters"))
+
+        self._comp_names = names
+        self._comp_types = types
+        self._comp_nodes = nodes_col
+        self._comp_values = values
+        self._comp_params = params_col
+        self._components_view = None
     
+    def _clone_components(self) -> List[Dict[str, Any]]:
+        """
+        Build an independent copy of the component list.
+
+        Components only hold JSON-ish primitives (strings, numbers, a node
+        list, and a flat parameters dict), so a structural clone is much
+        cheaper than copy.deepcopy's recursive dispatch.  User-supplied
+        parameters that do nest containers are cloned through a pickle
+        round-trip, which runs in C and skips deepcopy's per-object memo
+        bookkeeping.
+
+        Returns:
+            A list of component dicts sharing no mutable state with the store
+        """
+        clone = []
+        for name, comp_type, nodes, value, params in zip(
+                self._comp_names, self._comp_types, self._comp_nodes,
+                self._comp_values, self._comp_params):
+            component = {"name": name, "type": comp_type, "nodes": list(nodes)}
+            if value is not None:
+                component["value"] = value
+            if params is not None:
+                if any(type(v) in (dict, list) for v in params.values()):
+                    component["parameters"] = pickle.loads(
+                        pickle.dumps(params, protocol=pickle.HIGHEST_PROTOCOL)
+                    )
+                else:
+                    component["parameters"] = dict(params)
+            clone.append(component)
+        return clone
+
     def _increment_version(self, save_components: bool = False) -> None:
         """
         Increment the circuit version and optionally save current state to history.
@@ -151,31 +543,150 @@ class Circuit:
         Args:
             save_components: Whether to save a copy of current components to history
         """
+        self._touch()
+
         if save_components:
             # Save current state to history
             old_state = {
                 "version": self.version,
-                "components": copy.deepcopy(self.components)
+                "components": self._clone_components()
             }
             self.history.append(old_state)
-            
+            self._history_index[old_state["version"]] = old_state
+
         # Increment version
         self.version += 1
+
+        if save_components:
+            # The old version stays retrievable from history
+            self._versions.append(self.version)
+        else:
+            # The old version is gone; only the new one is current
+            self._versions[-1] = self.version
     
+    @property
+    def available_versions(self) -> List[int]:
+        """All retrievable versions of this circuit (archived + current)."""
+        return self._versions
+
+    def restore_version(self, version: int) -> None:
+        """
+        Restore the persisted version counter after a load from disk.
+
+        History is not persisted, so a freshly loaded circuit's only
+        retrievable version is the current one; assigning `version`
+        directly would leave _versions stale.
+
+        Args:
+            version: The version number stored on disk
+        """
+        self.version = version
+        self._versions = [version]
+
+    def get_history_version(self, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up an archived version of the circuit.
+
+        Args:
+            version: The version number to retrieve
+
+        Returns:
+            The history record for that version, or None if not archived
+        """
+        return self._history_index.get(version)
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the circuit to a dictionary representation.
-        
+
+        The result is memoized against the revision counter: every
+        mutation path bumps the revision, so serving repeated reads
+        (list/get endpoints, persistence) costs a comparison instead of
+        re-cloning the component list each call.
+
         Returns:
             Dictionary representation of the circuit
         """
-        return {
-            "id": self.id,
-            "name": self.name,
-            "version": self.version,
-            "components": copy.deepcopy(self.components)
-        }
+        if self._dict_cache is None or self._dict_cache_revision != self._revision:
+            self._dict_cache = {
+                "id": self.id,
+                "name": self.name,
+                "version": self.version,
+                "components": self._clone_components()
+            }
+            self._dict_cache_revision = self._revision
+        return self._dict_cache
         
+    def build_netlist(self) -> str:
+        """
+        Generate a SPICE netlist string from the component list.
+
+        The text is a pure function of the component list and is
+        memoized against the revision counter, like to_dict().
+
+        Returns:
+            The circuit as SPICE netlist text
+        """
+        if self._netlist_cache is not None and self._netlist_cache_revision == self._revision:
+            return self._netlist_cache
+
+        lines = [f"* {self.name}"]
+
+        for comp in self.components:
+            # SPICE uses node 0 for ground
+            nodes = " ".join(
+                "0" if str(node).lower() in _GROUND_NAMES else str(node)
+                for node in comp["nodes"]
+            )
+
+            line = f"{comp['name']} {nodes}"
+            if comp.get("value") is not None:
+                line += f" {comp['value']}"
+
+            lines.append(line)
+
+        lines.append(".end")
+        self._netlist_cache = "\n".join(lines)
+        self._netlist_cache_revision = self._revision
+        return self._netlist_cache
+
+    def partition(self) -> List[List[Dict[str, Any]]]:
+        """
+        Split the circuit into electrically independent sub-circuits.
+
+        Components are grouped with union-find over shared nets; ground
+        aliases couple nothing, since every sub-circuit references the
+        same node 0. Disjoint groups obey Kirchhoff's laws independently,
+        so each can be solved on its own with exact results.
+
+        Returns:
+            List of component-dict lists, one per connected sub-circuit
+        """
+        count = len(self._comp_names)
+        parent = list(range(count))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]  # Path halving
+                i = parent[i]
+            return i
+
+        # Union components that share a non-ground net
+        node_owner: Dict[str, int] = {}
+        for i, nodes in enumerate(self._comp_nodes):
+            for node in nodes:
+                if node.lower() in _GROUND_NAMES:
+                    continue
+                j = node_owner.setdefault(node, i)
+                if j != i:
+                    parent[find(i)] = find(j)
+
+        groups: Dict[int, List[Dict[str, Any]]] = {}
+        view = self.components
+        for i in range(count):
+            groups.setdefault(find(i), []).append(view[i])
+        return list(groups.values())
+
     def simulate(self, analysis: str = "operating_point", sim_params: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Simulate the circuit using PySpice.
@@ -187,156 +698,74 @@ class Circuit:
         Returns:
             Dictionary containing simulation results
         """
+        _ensure_pyspice()
+
         if sim_params is None:
             sim_params = {}
-            
+
+        # Operating-point analyses of circuits that split into disjoint
+        # sub-circuits are solved per partition and merged: the solver
+        # cost is superlinear in matrix size, so k independent blocks are
+        # strictly cheaper than one combined system.  (Sweep analyses
+        # keep the combined netlist: their source or time axis spans the
+        # whole circuit.)
+        if analysis == "operating_point" and len(self._comp_names) > 1:
+            partitions = self.partition()
+            if len(partitions) > 1:
+                merged: Dict[str, Any] = {"nodes": {}, "branches": {}}
+                for part in partitions:
+                    sub = Circuit(self.id, self.name)
+                    sub.components = part
+                    part_results = sub.simulate("operating_point", sim_params)
+                    merged["nodes"].update(part_results.get("nodes", {}))
+                    merged["branches"].update(part_results.get("branches", {}))
+                return merged
+
         # Create PySpice Circuit
         spice_circuit = SpiceCircuit(self.name)
         
-        # Add components to the PySpice circuit
-        for comp in self.components:
-            comp_type = comp["type"]
-            nodes = comp["nodes"]
-            value = comp.get("value")
-            params = comp.get("parameters", {})
-            
-            # Normalize node names (treat "0", "gnd", "ground" as ground)
-            def normalize_node(node):
-                if node and str(node).lower() in ("0", "gnd", "ground"):
-                    return spice_circuit.gnd
-                return node
+        # Device models declared on this spice_circuit so far; avoids an
+        # attribute probe into PySpice per diode/transistor
+        declared_models: set = set()
+
+        # Ground aliases resolve to the same PySpice node; bind it and a
+        # per-call normalization cache as locals once instead of redefining
+        # a closure for every component
+        gnd = spice_circuit.gnd
+        normalized_nodes: Dict[Any, Any] = {}
+
+        # Add components to the PySpice circuit, iterating the storage
+        # columns directly so the hot loop does no dict lookups
+        for name, comp_type, nodes, value, params in zip(
+                self._comp_names, self._comp_types, self._comp_nodes,
+                self._comp_values, self._comp_params):
+            params = params or {}
             
-            # Map nodes to PySpice nodes
-            spice_nodes = [normalize_node(node) for node in nodes]
+            # Map nodes to PySpice nodes (treat "0", "gnd", "ground" as
+            # ground); circuits reuse the same handful of nets, so cache
+            # each normalization for the duration of this call
+            spice_nodes = []
+            for node in nodes:
+                try:
+                    spice_nodes.append(normalized_nodes[node])
+                except KeyError:
+                    resolved = gnd if node and str(node).lower() in _GROUND_NAMES else node
+                    normalized_nodes[node] = resolved
+                    spice_nodes.append(resolved)
             
-            # Add component based on type
+            # Add component via the type dispatch table; unknown types
+            # are ignored, matching the old if/elif chain
+            handler = _DISPATCH.get(comp_type)
+            if handler is None:
+                continue
             try:
-                if comp_type == "R":  # Resistor
-                    spice_circuit.R(comp["name"], spice_nodes[0], spice_nodes[1], value @ u_Ω)
-                    
-                elif comp_type == "C":  # Capacitor
-                    spice_circuit.C(comp["name"], spice_nodes[0], spice_nodes[1], value @ u_F)
-                    
-                elif comp_type == "L":  # Inductor
-                    spice_circuit.L(comp["name"], spice_nodes[0], spice_nodes[1], value @ u_H)
-                    
-                elif comp_type == "V":  # Voltage Source
-                    # Handle different voltage source types
-                    if params and "type" in params:
-                        if params["type"] == "sine":
-                            amplitude = params.get("amplitude", value or 1)
-                            frequency = params.get("frequency", 1000)
-                            offset = params.get("offset", 0)
-                            spice_circuit.SinusoidalVoltageSource(
-                                comp["name"], 
-                                spice_nodes[0], 
-                                spice_nodes[1], 
-                                amplitude=amplitude @ u_V,
-                                frequency=frequency @ u_Hz,
-                                offset=offset @ u_V
-                            )
-                        elif params["type"] == "pulse":
-                            initial = params.get("initial", 0)
-                            pulsed = params.get("pulsed", value or 5)
-                            delay = params.get("delay", 0)
-                            rise_time = params.get("rise_time", 1e-9)
-                            fall_time = params.get("fall_time", 1e-9)
-                            pulse_width = params.get("pulse_width", 1e-3)
-                            period = params.get("period", 2e-3)
-                            spice_circuit.PulseVoltageSource(
-                                comp["name"],
-                                spice_nodes[0],
-                                spice_nodes[1],
-                                initial_value=initial @ u_V,
-                                pulsed_value=pulsed @ u_V,
-                                delay_time=delay @ u_s,
-                                rise_time=rise_time @ u_s,
-                                fall_time=fall_time @ u_s,
-                                pulse_width=pulse_width @ u_s,
-                                period=period @ u_s
-                            )
-                        else:
-                            # Default to DC source
-                            spice_circuit.V(comp["name"], spice_nodes[0], spice_nodes[1], value @ u_V)
-                    else:
-                        # Default to DC source
-                        spice_circuit.V(comp["name"], spice_nodes[0], spice_nodes[1], value @ u_V)
-                        
-                elif comp_type == "I":  # Current Source
-                    spice_circuit.I(comp["name"], spice_nodes[0], spice_nodes[1], value @ u_A)
-                    
-                elif comp_type == "D":  # Diode
-                    model_name = params.get("model", "default_diode")
-                    # Add diode model if not already defined
-                    if not hasattr(spice_circuit, f"model_{model_name}"):
-                        spice_circuit.model(model_name, "D", is_=params.get("is", 1e-14),
-                                           n=params.get("n", 1), vj=params.get("vj", 1))
-                    spice_circuit.D(comp["name"], spice_nodes[0], spice_nodes[1], model=model_name)
-                    
-                elif comp_type == "Q":  # BJT Transistor
-                    model_name = params.get("model", "default_npn")
-                    # Add BJT model if not already defined
-                    if not hasattr(spice_circuit, f"model_{model_name}"):
-                        spice_circuit.model(model_name, "NPN", bf=params.get("bf", 100))
-                    spice_circuit.Q(comp["name"], spice_nodes[0], spice_nodes[1], spice_nodes[2], model=model_name)
-                    
-                elif comp_type == "U":  # Universal Verification Component (UVX)
-                    uvx_type = params.get("uvx_type", "opamp")
-                    
-                    if uvx_type == "opamp":
-                        # Implement op-amp using a voltage-controlled voltage source
-                        # Typically: output, -, +, vcc, vee
-                        gain = params.get("gain", 1e6)
-                        if len(spice_nodes) >= 3:
-                            # Create internal nodes
-                            int_node1 = f"int_{comp['name']}_1"
-                            int_node2 = f"int_{comp['name']}_2"
-                            
-                            # Add high-impedance inputs
-                            spice_circuit.R(f"{comp['name']}_in_p", spice_nodes[2], int_node1, 1e9 @ u_Ω)
-                            spice_circuit.R(f"{comp['name']}_in_n", spice_nodes[1], int_node2, 1e9 @ u_Ω)
-                            
-                            # Add voltage-controlled voltage source
-                            spice_circuit.VCVS(comp["name"], spice_nodes[0], spice_circuit.gnd, int_node1, int_node2, gain)
-                    
-                    elif uvx_type == "comparator":
-                        # Implement comparator with a B source (behavioral source)
-                        spice_circuit.B(
-                            comp["name"], 
-                            spice_nodes[0], 
-                            spice_circuit.gnd, 
-                            f"V=if(v({spice_nodes[2]})-v({spice_nodes[1]})>0, {params.get('high', 5)}, {params.get('low', 0)})"
-                        )
-                        
-                    elif uvx_type == "adc":
-                        # Simplified ADC model
-                        # In real implementation, this would be much more complex
-                        bits = params.get("bits", 8)
-                        ref = params.get("reference", 5)
-                        spice_circuit.B(
-                            comp["name"],
-                            spice_nodes[0],
-                            spice_circuit.gnd,
-                            f"V=floor(v({spice_nodes[1]})*{2**bits-1}/{ref}+0.5)*{ref}/{2**bits-1}"
-                        )
-                    
-                    elif uvx_type == "dac":
-                        # Simplified DAC model
-                        bits = params.get("bits", 8)
-                        ref = params.get("reference", 5)
-                        # Assume digital input is already scaled to 0-1 range
-                        spice_circuit.B(
-                            comp["name"],
-                            spice_nodes[0],
-                            spice_circuit.gnd,
-                            f"V=v({spice_nodes[1]})*{ref}"
-                        )
+                handler(spice_circuit, name, spice_nodes, value, params, declared_models)
             except Exception as e:
-                logger.exception(f"Error adding component {comp['name']} to circuit: {str(e)}")
-                raise ValueError(f"Error adding component {comp['name']}: {str(e)}")
+                logger.exception(f"Error adding component {name} to circuit: {str(e)}")
+                raise ValueError(f"Error adding component {name}: {str(e)}")
         
-        # Create simulator
-        simulator = NgSpiceShared.new_instance(spice_circuit)
+        # Build the simulator on the warm shared ngspice engine
+        simulator = _make_simulator(spice_circuit)
         
         # Run simulation based on analysis type
         analysis = analysis.lower()
@@ -347,18 +776,18 @@ class Circuit:
                 # Run operating point analysis
                 op = simulator.operating_point()
                 
-                # Collect node voltages
-                results["nodes"] = {}
-                for node in op.nodes.values():
-                    node_name = str(node)
-                    if node_name not in ("0", "gnd"):
-                        results["nodes"][node_name] = float(node)
-                
-                # Collect branch currents
-                results["branches"] = {}
-                for branch in op.branches.values():
-                    branch_name = str(branch)
-                    results["branches"][branch_name] = float(branch)
+                # Collect node voltages and branch currents; the dict
+                # comprehensions allocate each table at its final size
+                # instead of growing it insert by insert
+                results["nodes"] = {
+                    node_name: float(node)
+                    for node in op.nodes.values()
+                    if (node_name := str(node)) not in _GROUND_NAMES
+                }
+                results["branches"] = {
+                    str(branch): float(branch)
+                    for branch in op.branches.values()
+                }
                     
             elif analysis == "dc":
                 # Get DC sweep parameters
@@ -371,26 +800,27 @@ class Circuit:
                     raise ValueError("DC analysis requires 'source', 'start', 'stop', 'step' parameters")
                 
                 # Run DC sweep analysis
-                analysis = simulator.dc_analysis(
+                analysis = simulator.dc(
                     **{source: slice(start, stop, step)}
                 )
                 
                 # Collect sweep values and results
                 results["sweep"] = {
                     "source": source,
-                    "values": [float(x) for x in analysis[source]]
+                    "values": np.asarray(analysis[source], dtype=np.float64).tolist()
                 }
                 
-                # Collect node voltages across sweep
-                results["nodes"] = {}
-                for node_name, node_values in analysis.nodes.items():
-                    if node_name not in ("0", "gnd"):
-                        results["nodes"][node_name] = [float(v) for v in node_values]
-                
-                # Collect branch currents across sweep
-                results["branches"] = {}
-                for branch_name, branch_values in analysis.branches.items():
-                    results["branches"][branch_name] = [float(i) for i in branch_values]
+                # Collect node voltages and branch currents across the
+                # sweep, sizing each dict in one shot
+                results["nodes"] = {
+                    node_name: np.asarray(node_values, dtype=np.float64).tolist()
+                    for node_name, node_values in analysis.nodes.items()
+                    if node_name not in _GROUND_NAMES
+                }
+                results["branches"] = {
+                    branch_name: np.asarray(branch_values, dtype=np.float64).tolist()
+                    for branch_name, branch_values in analysis.branches.items()
+                }
                     
             elif analysis == "ac":
                 # Get AC analysis parameters
@@ -400,7 +830,7 @@ class Circuit:
                 variation = sim_params.get("variation", "dec")  # dec, oct, lin
                 
                 # Run AC analysis
-                analysis = simulator.ac_analysis(
+                analysis = simulator.ac(
                     start_frequency=start_freq @ u_Hz,
                     stop_frequency=stop_freq @ u_Hz,
                     number_of_points=num_points,
@@ -408,25 +838,28 @@ class Circuit:
                 )
                 
                 # Collect frequencies
-                results["frequency"] = {"values": [float(f) for f in analysis.frequency]}
+                results["frequency"] = {"values": np.asarray(analysis.frequency, dtype=np.float64).tolist()}
                 
-                # Collect node voltages (complex numbers) across frequencies
-                results["nodes"] = {}
-                for node_name, node_values in analysis.nodes.items():
-                    if node_name not in ("0", "gnd"):
-                        # Store magnitude and phase
-                        results["nodes"][node_name] = {
-                            "magnitude": [float(abs(v)) for v in node_values],
-                            "phase": [float(math.degrees(math.atan2(v.imag, v.real))) for v in node_values]
-                        }
-                
-                # Collect branch currents across frequencies
-                results["branches"] = {}
-                for branch_name, branch_values in analysis.branches.items():
-                    results["branches"][branch_name] = {
-                        "magnitude": [float(abs(i)) for i in branch_values],
-                        "phase": [float(math.degrees(math.atan2(i.imag, i.real))) for i in branch_values]
+                # Collect node voltages and branch currents (complex
+                # numbers) across frequencies.  Magnitude and phase come
+                # from one vectorized pass per array, and the outer dicts
+                # are built in a single allocation.
+                def _mag_phase(values):
+                    arr = np.asarray(values, dtype=np.complex128)
+                    return {
+                        "magnitude": np.abs(arr).tolist(),
+                        "phase": np.degrees(np.angle(arr)).tolist()
                     }
+
+                results["nodes"] = {
+                    node_name: _mag_phase(node_values)
+                    for node_name, node_values in analysis.nodes.items()
+                    if node_name not in _GROUND_NAMES
+                }
+                results["branches"] = {
+                    branch_name: _mag_phase(branch_values)
+                    for branch_name, branch_values in analysis.branches.items()
+                }
                     
             elif analysis == "transient":
                 # Get transient analysis parameters
@@ -437,24 +870,28 @@ class Circuit:
                     raise ValueError("Transient analysis requires 'step_time' and 'end_time' parameters")
                 
                 # Run transient analysis
-                analysis = simulator.transient_analysis(
+                analysis = simulator.transient(
                     step_time=step_time @ u_s,
                     end_time=end_time @ u_s
                 )
                 
-                # Collect time points
-                results["time"] = [float(t) for t in analysis.time]
-                
-                # Collect node voltages over time
-                results["nodes"] = {}
-                for node_name, node_values in analysis.nodes.items():
-                    if node_name not in ("0", "gnd"):
-                        results["nodes"][node_name] = [float(v) for v in node_values]
-                
-                # Collect branch currents over time
-                results["branches"] = {}
-                for branch_name, branch_values in analysis.branches.items():
-                    results["branches"][branch_name] = [float(i) for i in branch_values]
+                # Keep the traces as contiguous numpy arrays rather than
+                # expanding them into Python float lists: the response
+                # path serializes ndarrays straight from their buffers
+                # (orjson OPT_SERIALIZE_NUMPY), so boxing every sample
+                # into a PyFloat here would be pure overhead on the
+                # longest result payloads the server produces
+                results["time"] = np.asarray(analysis.time, dtype=np.float64)
+
+                results["nodes"] = {
+                    node_name: np.asarray(node_values, dtype=np.float64)
+                    for node_name, node_values in analysis.nodes.items()
+                    if node_name not in _GROUND_NAMES
+                }
+                results["branches"] = {
+                    branch_name: np.asarray(branch_values, dtype=np.float64)
+                    for branch_name, branch_values in analysis.branches.items()
+                }
                     
             else:
                 raise ValueError(f"Unsupported analysis type: {analysis}")
@@ -462,7 +899,7 @@ class Circuit:
         except Exception as e:
             logger.exception(f"Simulation error: {str(e)}")
             raise ValueError(f"Simulation failed: {str(e)}")
-            
+
         return results
     
     def draw_schematic(self, filepath: str) -> None:
@@ -472,14 +909,24 @@ class Circuit:
         Args:
             filepath: Path to save the schematic image
         """
-        # Determine file format from filepath extension
-        format = filepath.split(".")[-1].lower()
-        if format not in ("png", "svg", "pdf"):
+        # Determine file format from filepath extension; os.path.splitext
+        # is C-implemented and allocates no intermediate list
+        format = os.path.splitext(filepath)[1][1:].lower()
+        if format not in _VALID_FORMATS:
             raise ValueError(f"Unsupported format: {format}. Use png, svg, or pdf.")
-        
-        # Initialize drawing
-        d = schemdraw.Drawing(show=False)
-        
+
+        _ensure_schemdraw()
+
+        # Initialize drawing.  SVG output uses schemdraw's pure-Python SVG
+        # backend, skipping matplotlib and the Agg renderer entirely; PNG
+        # and PDF fall back to matplotlib
+        if format == "svg":
+            d = schemdraw.Drawing(show=False, backend="svg")
+        else:
+            import matplotlib
+            matplotlib.use("Agg")  # Non-GUI backend
+            d = schemdraw.Drawing(show=False)
+
         # Map component types to SchemDraw elements
         component_map = {
             "R": elm.Resistor,
@@ -492,82 +939,70 @@ class Circuit:
             "U": None  # Handle UVX components specially
         }
         
-        # Track nodes positions
-        node_positions = {"0": (0, 0)}  # Ground at origin
-        next_pos = (0, 2)  # Start position
-        
-        # First pass: place components and calculate node positions
-        for i, comp in enumerate(self.components):
-            comp_type = comp["type"]
-            nodes = comp["nodes"]
-            
-            # Skip unhandled component types
-            if comp_type not in component_map or component_map[comp_type] is None:
-                continue
-                
-            # Determine component element
-            elem_class = component_map[comp_type]
-            
-            # Create element
-            elem = elem_class()
-            
-            # Calculate position based on nodes
-            # This is a simplified placement algorithm
-            if len(nodes) >= 2:
-                node1, node2 = nodes[0], nodes[1]
-                
-                # If nodes don't have positions yet, assign them
-                if node1 not in node_positions:
-                    node_positions[node1] = (next_pos[0], next_pos[1])
-                    next_pos = (next_pos[0] + 2, next_pos[1])
-                    
-                if node2 not in node_positions:
-                    node_positions[node2] = (next_pos[0], next_pos[1])
-                    next_pos = (next_pos[0] + 2, next_pos[1])
-        
-        # Second pass: add components to drawing
-        for comp in self.components:
-            comp_type = comp["type"]
-            name = comp["name"]
-            nodes = comp["nodes"]
-            
+        # Node positions as parallel coordinate buffers indexed by a
+        # string->int lookup table; ground sits at the origin
+        node_idx: Dict[str, int] = {"0": 0}
+        xs: List[float] = [0.0]
+        ys: List[float] = [0.0]
+        next_x = 0.0  # Simplified placement: march along y=2
+
+        # First pass: assign node indices/coordinates and collect the
+        # drawable two-terminal components
+        drawable: List[Tuple[str, str, str, str]] = []
+        for name, comp_type, nodes in zip(
+            self._comp_names, self._comp_types, self._comp_nodes
+        ):
             # Skip unhandled component types
-            if comp_type not in component_map or component_map[comp_type] is None:
+            if component_map.get(comp_type) is None or len(nodes) < 2:
                 continue
-                
-            # Determine component element
-            elem_class = component_map[comp_type]
-            
-            # Create element
-            elem = elem_class().label(name)
-            
-            # Calculate position based on nodes
-            if len(nodes) >= 2:
-                node1, node2 = nodes[0], nodes[1]
-                
-                if node1 in node_positions and node2 in node_positions:
-                    pos1 = node_positions[node1]
-                    pos2 = node_positions[node2]
-                    
-                    # Add element at midpoint with appropriate angle
-                    mid_x = (pos1[0] + pos2[0]) / 2
-                    mid_y = (pos1[1] + pos2[1]) / 2
-                    
-                    dx = pos2[0] - pos1[0]
-                    dy = pos2[1] - pos1[1]
-                    angle = math.degrees(math.atan2(dy, dx))
-                    
-                    d.add(elem, at=(mid_x, mid_y), theta=angle)
-                    
-                    # Add node labels
-                    if node1 != "0" and node1 != "gnd":
-                        d.add(elm.Dot().label(node1), at=pos1)
-                    if node2 != "0" and node2 != "gnd":
-                        d.add(elm.Dot().label(node2), at=pos2)
-        
+
+            node1, node2 = nodes[0], nodes[1]
+
+            # If nodes don't have positions yet, assign them
+            if node1 not in node_idx:
+                node_idx[node1] = len(xs)
+                xs.append(next_x)
+                ys.append(2.0)
+                next_x += 2.0
+            if node2 not in node_idx:
+                node_idx[node2] = len(xs)
+                xs.append(next_x)
+                ys.append(2.0)
+                next_x += 2.0
+
+            drawable.append((name, comp_type, node1, node2))
+
+        # Solve all midpoints and rotation angles in one vectorized pass
+        # instead of per-component atan2/degrees calls
+        xs_arr = np.asarray(xs, dtype=np.float64)
+        ys_arr = np.asarray(ys, dtype=np.float64)
+        count = len(drawable)
+        n1 = np.fromiter(
+            (node_idx[entry[2]] for entry in drawable), dtype=np.int32, count=count
+        )
+        n2 = np.fromiter(
+            (node_idx[entry[3]] for entry in drawable), dtype=np.int32, count=count
+        )
+        angles = np.degrees(np.arctan2(ys_arr[n2] - ys_arr[n1], xs_arr[n2] - xs_arr[n1]))
+        mid_xs = (xs_arr[n1] + xs_arr[n2]) * 0.5
+        mid_ys = (ys_arr[n1] + ys_arr[n2]) * 0.5
+
+        # Second pass: add components to the drawing at the precomputed
+        # positions
+        for i, (name, comp_type, node1, node2) in enumerate(drawable):
+            elem = component_map[comp_type]().label(name)
+            d.add(elem, at=(mid_xs[i], mid_ys[i]), theta=angles[i])
+
+            # Add node labels
+            if node1 != "0" and node1 != "gnd":
+                idx = node_idx[node1]
+                d.add(elm.Dot().label(node1), at=(xs_arr[idx], ys_arr[idx]))
+            if node2 != "0" and node2 != "gnd":
+                idx = node_idx[node2]
+                d.add(elm.Dot().label(node2), at=(xs_arr[idx], ys_arr[idx]))
+
         # Add ground symbols
-        if "0" in node_positions:
-            d.add(elm.Ground(), at=node_positions["0"])
+        d.add(elm.Ground(), at=(0, 0))
             
         # Save the drawing
         d.save(filepath) 
\ No newline at end of file
@@ -8,8 +8,31 @@ import argparse
 import logging
 from typing import List, Optional
 
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
 # Import our mcp server
 from .mcp_server import mcp
+from .api import router
+
+# FastAPI application exposing the HTTP API defined in api.py
+app = FastAPI(
+    title="CircuitMCP",
+    description="Circuit simulation capabilities exposed over HTTP",
+    default_response_class=ORJSONResponse,
+)
+app.include_router(router)
+
+# Compress large responses (transient sweeps can be megabytes of JSON);
+# the minimum_size floor keeps small payloads uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+@app.get("/health", tags=["health"], summary="Health check")
+async def health():
+    """Simple liveness probe."""
+    return {"status": "ok"}
 
 def setup_logging(debug: bool = False) -> None:
     """Configure logging for the application"""
@@ -25,44 +48,68 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="CircuitMCP Server")
     parser.add_argument(
-        "--debug", 
-        action="store_true", 
+        "--debug",
+        action="store_true",
         help="Enable debug logging"
     )
     parser.add_argument(
-        "--host", 
-        type=str, 
-        default="127.0.0.1", 
+        "--host",
+        type=str,
+        default="127.0.0.1",
         help="Host address to bind server"
     )
     parser.add_argument(
-        "--port", 
-        type=int, 
-        default=8000, 
+        "--port",
+        type=int,
+        default=8000,
         help="Port to bind server"
     )
-    
+
     return parser.parse_args(args)
 
+def serve(host: str, port: int) -> None:
+    """
+    Serve the HTTP API with uvicorn.
+
+    Uses the uvloop event loop and httptools HTTP parser when they are
+    installed (both ship with `uvicorn[standard]`); uvicorn falls back to
+    the stdlib asyncio loop and h11 parser otherwise.
+
+    Args:
+        host: Host address to bind the server
+        port: Port to bind the server
+    """
+    import uvicorn
+
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        loop="auto",   # prefers uvloop when available
+        http="auto",   # prefers httptools when available
+        timeout_keep_alive=30,
+    )
+
 def main(args: Optional[List[str]] = None) -> int:
     """
     Main entry point function for the Circuit MCP Server
-    
+
     Args:
         args: Command line arguments
-        
+
     Returns:
         Exit code (0 for success)
     """
     parsed_args = parse_args(args)
     setup_logging(parsed_args.debug)
-    
+
     logger = logging.getLogger(__name__)
     logger.info(f"Starting CircuitMCP Server on {parsed_args.host}:{parsed_args.port}")
-    
+
     try:
-        # Run the MCP server
+        # Announce the MCP tools/resources, then serve the HTTP API
         mcp.run(host=parsed_args.host, port=parsed_args.port)
+        serve(parsed_args.host, parsed_args.port)
         return 0
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
@@ -72,4 +119,4 @@ def main(args: Optional[List[str]] = None) -> int:
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
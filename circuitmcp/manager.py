@@ -3,21 +3,51 @@ CircuitManager for handling circuit creation, storage and retrieval.
 """
 
 import os
-import json
+import atexit
 import logging
-from typing import Dict, List, Optional, Any
+import itertools
+import threading
+import zlib
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+import orjson
+
 from .circuit import Circuit
 
 logger = logging.getLogger(__name__)
 
 class CircuitManager:
     """Manages the collection of Circuit instances for creation/retrieval/update/delete operations."""
-    # Class variables for storage
+    # Class variables for storage.  IDs come from itertools.count: next()
+    # on it is a single C call, atomic under the GIL, so concurrent
+    # creates never race a read-modify-write.  _last_id tracks the
+    # highest ID handed out, for persistence (a count can't be peeked).
     _circuits: Dict[int, Circuit] = {}
-    _next_id: int = 1
+    _id_counter: "itertools.count" = itertools.count(1)
+    _last_id: int = 0
     _persistence_path: Optional[str] = None
+
+    # Debounced, per-circuit persistence: mutations record which circuit
+    # IDs changed (or were deleted) and arm a short timer, so a burst of
+    # changes collapses into one write per touched circuit rather than a
+    # rewrite of the whole store
+    _SAVE_DELAY = 0.1  # seconds
+    _dirty_ids: set = set()
+    _deleted_ids: set = set()
+    _meta_dirty: bool = False
+    _flush_timer: Optional[threading.Timer] = None
+    _save_lock = threading.Lock()
+
+    # Serialized "list all circuits" JSON, rebuilt lazily whenever the
+    # fingerprint of the stored circuits changes
+    _list_cache: Optional[bytes] = None
+    _list_cache_fingerprint: Optional[Tuple] = None
+    _list_cache_etag: str = 'W/"0"'
+
+    # Per-circuit summary rows, rebuilt on the same fingerprint scheme
+    _summary_cache: Optional[List[Dict[str, Any]]] = None
+    _summary_fingerprint: Optional[Tuple] = None
     
     @classmethod
     def initialize(cls, persistence_path: Optional[str] = None):
@@ -25,7 +55,7 @@ class CircuitManager:
         Initialize the CircuitManager, optionally with persistence.
         
         Args:
-            persistence_path: Optional path to store/load circuit data
+            persistence_path: Optional directory to store/load circuit data
         """
         cls._persistence_path = persistence_path
         if persistence_path:
@@ -34,6 +64,8 @@ class CircuitManager:
             except Exception as e:
                 logger.warning(f"Failed to load circuit data from disk: {e}")
                 # Continue with empty state
+            # Guarantee any pending debounced write lands on exit
+            atexit.register(cls.flush)
     
     @classmethod
     def create_circuit(cls, name: Optional[str] = None, components: Optional[List[Dict[str, Any]]] = None) -> Circuit:
@@ -47,28 +79,22 @@ class CircuitManager:
         Returns:
             The newly created Circuit instance
         """
-        cid = cls._next_id
-        cls._next_id += 1
-        
+        cid = next(cls._id_counter)
+        cls._last_id = cid
+
         # Create new Circuit instance
         circuit = Circuit(circuit_id=cid, name=name)
         
-        # Add initial components if provided
+        # Add initial components if provided, in one batch; populating a
+        # brand-new circuit is not an edit, so it stays at version 1
         if components:
-            for comp in components:
-                circuit.add_component(
-                    comp["type"],
-                    comp["nodes"],
-                    comp.get("value"),
-                    comp.get("parameters")
-                )
-                
+            circuit.bulk_add_components(components)
+
         # Store the circuit
         cls._circuits[cid] = circuit
         
-        # Persist if configured
-        if cls._persistence_path:
-            cls._save_to_disk()
+        # Persist if configured (debounced)
+        cls._schedule_save(cid, meta=True)
             
         return circuit
     
@@ -103,20 +129,50 @@ class CircuitManager:
         if not circuit:
             return None
             
-        # Update name if provided
+        # Update name if provided; the rename must bump the revision or
+        # the to_dict memo (and the persisted file built from it) would
+        # keep serving the old name
         if name is not None:
             circuit.name = name
-            
+            circuit._touch()
+
+
         # Update components if provided
         if components is not None:
             circuit.update_components(components)
             
-        # Persist if configured
-        if cls._persistence_path:
-            cls._save_to_disk()
+        # Persist if configured (debounced)
+        cls._schedule_save(cid)
             
         return circuit
     
+    @classmethod
+    def rename(cls, cid: int, name: str) -> Optional[Circuit]:
+        """
+        Rename a circuit by ID, bumping its version.
+
+        Routing the rename through the manager keeps version tracking and
+        the cached list/ETag state consistent.
+
+        Args:
+            cid: The circuit ID to rename
+            name: New name for the circuit
+
+        Returns:
+            The renamed Circuit if found, None otherwise
+        """
+        circuit = cls.get_circuit(cid)
+        if not circuit:
+            return None
+
+        circuit.name = name
+        circuit._increment_version()
+
+        # Persist if configured (debounced)
+        cls._schedule_save(cid)
+
+        return circuit
+
     @classmethod
     def delete_circuit(cls, cid: int) -> bool:
         """
@@ -130,11 +186,10 @@ class CircuitManager:
         """
         if cid in cls._circuits:
             del cls._circuits[cid]
-            
-            # Persist if configured
-            if cls._persistence_path:
-                cls._save_to_disk()
-                
+
+            # Remove the circuit's file (debounced)
+            cls._schedule_delete(cid)
+
             return True
         return False
     
@@ -149,62 +204,241 @@ class CircuitManager:
         return list(cls._circuits.values())
     
     @classmethod
-    def _save_to_disk(cls):
-        """Persist circuit data to disk."""
+    def get_summaries(cls) -> List[Dict[str, Any]]:
+        """
+        Get summary rows (id, name, version, component count) for all circuits.
+
+        The rows are cached and only rebuilt when a circuit is created,
+        deleted, renamed, or modified; repeat listings of an unchanged
+        store return the prebuilt list without touching any circuit.
+
+        Returns:
+            List of summary dicts, one per circuit
+        """
+        fingerprint = tuple(
+            (cid, circuit.revision, circuit.name)
+            for cid, circuit in cls._circuits.items()
+        )
+
+        if cls._summary_cache is None or fingerprint != cls._summary_fingerprint:
+            cls._summary_cache = [
+                {
+                    "id": circuit.id,
+                    "name": circuit.name,
+                    "version": circuit.version,
+                    "components_count": len(circuit.components)
+                }
+                for circuit in cls._circuits.values()
+            ]
+            cls._summary_fingerprint = fingerprint
+
+        return cls._summary_cache
+
+    @classmethod
+    def get_list_bytes(cls) -> bytes:
+        """
+        Get the list of all circuits as pre-serialized JSON bytes.
+
+        The encoded blob is cached and only rebuilt when a circuit is
+        created, deleted, renamed, or modified (any modification bumps the
+        circuit's revision, which is part of the cache fingerprint).
+
+        Returns:
+            JSON-encoded array of all circuits
+        """
+        fingerprint = tuple(
+            (cid, circuit.revision, circuit.name)
+            for cid, circuit in cls._circuits.items()
+        )
+
+        if cls._list_cache is None or fingerprint != cls._list_cache_fingerprint:
+            cls._list_cache = orjson.dumps(
+                [circuit.to_dict() for circuit in cls._circuits.values()]
+            )
+            cls._list_cache_fingerprint = fingerprint
+            # Weak ETag over the fingerprint so HTTP clients can
+            # revalidate.  crc32 of the serialized fingerprint, not
+            # hash(): the built-in is salted per process, which would
+            # hand every restart/worker a different tag for equal state
+            cls._list_cache_etag = f'W/"{zlib.crc32(repr(fingerprint).encode()):08x}"'
+
+        return cls._list_cache
+
+    @classmethod
+    def get_list_etag(cls) -> str:
+        """
+        Get the ETag matching the current cached circuit list.
+
+        Callers should invoke get_list_bytes() first so the tag reflects
+        the latest state.
+
+        Returns:
+            A weak ETag string for the list payload
+        """
+        return cls._list_cache_etag
+
+    @classmethod
+    def _circuits_dir(cls) -> str:
+        """Directory holding the per-circuit JSON files."""
+        return os.path.join(cls._persistence_path, "circuits")
+
+    @classmethod
+    def _meta_path(cls) -> str:
+        """Path of the metadata file (next_id)."""
+        return os.path.join(cls._persistence_path, "meta.json")
+
+    @classmethod
+    def _schedule_save(cls, cid: Optional[int] = None, meta: bool = False):
+        """
+        Record a pending write and arm the debounce timer.
+
+        Mutations in a burst re-use the already-armed timer, and each
+        touched circuit is written once no matter how often it changed.
+
+        Args:
+            cid: Circuit ID whose file needs rewriting, if any
+            meta: Whether the metadata file (next_id) needs rewriting
+        """
         if not cls._persistence_path:
             return
-            
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(cls._persistence_path), exist_ok=True)
-        
-        # Convert circuit objects to serializable format
-        data = {
-            "next_id": cls._next_id,
-            "circuits": {}
-        }
-        
-        for cid, circuit in cls._circuits.items():
-            # Convert each circuit to dict
-            data["circuits"][cid] = circuit.to_dict()
-            
-        # Write to file
-        with open(cls._persistence_path, 'w') as f:
-            json.dump(data, f, indent=2)
-            
+        with cls._save_lock:
+            if cid is not None:
+                cls._dirty_ids.add(cid)
+                cls._deleted_ids.discard(cid)
+            if meta:
+                cls._meta_dirty = True
+            if cls._flush_timer is None:
+                # Debounced background writes skip fsync; durability is
+                # paid only on explicit flush() / shutdown
+                cls._flush_timer = threading.Timer(
+                    cls._SAVE_DELAY, cls.flush, kwargs={"durable": False}
+                )
+                cls._flush_timer.daemon = True
+                cls._flush_timer.start()
+
+    @classmethod
+    def _schedule_delete(cls, cid: int):
+        """Record a pending file removal and arm the debounce timer."""
+        if not cls._persistence_path:
+            return
+        with cls._save_lock:
+            cls._dirty_ids.discard(cid)
+            cls._deleted_ids.add(cid)
+            if cls._flush_timer is None:
+                # Debounced background writes skip fsync; durability is
+                # paid only on explicit flush() / shutdown
+                cls._flush_timer = threading.Timer(
+                    cls._SAVE_DELAY, cls.flush, kwargs={"durable": False}
+                )
+                cls._flush_timer.daemon = True
+                cls._flush_timer.start()
+
+    @classmethod
+    def flush(cls, durable: bool = True):
+        """
+        Write any pending state to disk immediately.
+
+        Args:
+            durable: Whether to fsync each file before renaming it into
+                place. Timer-driven background flushes pass False so a
+                mutation burst costs no fsyncs; explicit and shutdown
+                flushes keep the default.
+        """
+        with cls._save_lock:
+            if cls._flush_timer is not None:
+                cls._flush_timer.cancel()
+                cls._flush_timer = None
+            dirty = cls._dirty_ids
+            deleted = cls._deleted_ids
+            meta_dirty = cls._meta_dirty
+            cls._dirty_ids = set()
+            cls._deleted_ids = set()
+            cls._meta_dirty = False
+
+        if not (dirty or deleted or meta_dirty):
+            return
+
+        os.makedirs(cls._circuits_dir(), exist_ok=True)
+
+        for cid in dirty:
+            circuit = cls._circuits.get(cid)
+            if circuit is not None:
+                cls._save_circuit(cid, circuit, durable)
+        for cid in deleted:
+            try:
+                os.unlink(os.path.join(cls._circuits_dir(), f"{cid}.json"))
+            except FileNotFoundError:
+                pass
+        if meta_dirty:
+            cls._save_meta(durable)
+
+    @classmethod
+    def _save_circuit(cls, cid: int, circuit: Circuit, durable: bool = False):
+        """Write one circuit's JSON file atomically (tmp + os.replace)."""
+        path = os.path.join(cls._circuits_dir(), f"{cid}.json")
+        tmp_path = path + ".tmp"
+        # Compact output (no indent) keeps orjson on its fast path; the
+        # files are machine-read, so readability costs nothing to drop
+        with open(tmp_path, 'wb', buffering=65536) as f:
+            f.write(orjson.dumps(circuit.to_dict()))
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _save_meta(cls, durable: bool = False):
+        """Write the metadata file atomically."""
+        path = cls._meta_path()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps({"next_id": cls._last_id + 1}))
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
     @classmethod
     def _load_from_disk(cls):
-        """Load circuit data from disk."""
-        if not cls._persistence_path or not os.path.exists(cls._persistence_path):
+        """Load circuit data from the persistence directory."""
+        if not cls._persistence_path:
             return
-            
-        # Read from file
-        with open(cls._persistence_path, 'r') as f:
-            data = json.load(f)
-            
-        # Update next ID
-        cls._next_id = data.get("next_id", 1)
-        
+
         # Clear existing circuits
         cls._circuits.clear()
-        
-        # Recreate circuits from data
-        for cid_str, circuit_data in data.get("circuits", {}).items():
-            cid = int(cid_str)
-            
-            # Create circuit
-            circuit = Circuit(circuit_id=cid, name=circuit_data.get("name"))
-            
-            # Set version
-            circuit.version = circuit_data.get("version", 1)
-            
-            # Add components
-            for comp in circuit_data.get("components", []):
-                circuit.add_component(
-                    comp["type"],
-                    comp["nodes"],
-                    comp.get("value"),
-                    comp.get("parameters")
-                )
-                
-            # Add to dictionary
-            cls._circuits[cid] = circuit 
\ No newline at end of file
+
+        # Recreate circuits from the per-circuit files
+        circuits_dir = cls._circuits_dir()
+        if os.path.isdir(circuits_dir):
+            with os.scandir(circuits_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json"):
+                        continue
+
+                    with open(entry.path, 'rb', buffering=65536) as f:
+                        circuit_data = orjson.loads(f.read())
+
+                    cid = int(entry.name[:-len(".json")])
+
+                    # Create circuit
+                    circuit = Circuit(circuit_id=cid, name=circuit_data.get("name"))
+
+                    # Add components in one batch, then restore the
+                    # stored version (keeping available_versions in sync)
+                    stored_components = circuit_data.get("components", [])
+                    if stored_components:
+                        circuit.bulk_add_components(stored_components)
+                    circuit.restore_version(circuit_data.get("version", 1))
+
+                    # Add to dictionary
+                    cls._circuits[cid] = circuit
+
+        # Restore the ID counter, falling back to the highest stored ID
+        meta_path = cls._meta_path()
+        if os.path.isfile(meta_path):
+            with open(meta_path, 'rb') as f:
+                next_id = orjson.loads(f.read()).get("next_id", 1)
+        else:
+            next_id = max(cls._circuits, default=0) + 1
+        cls._id_counter = itertools.count(next_id)
+        cls._last_id = next_id - 1
\ No newline at end of file
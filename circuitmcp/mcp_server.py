@@ -6,24 +6,16 @@ This file implements a server using the official Anthropic MCP Python SDK.
 import os
 import tempfile
 import logging
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 import math
 
 # Use our mock implementation instead of the official SDK
 from .mock_mcp import FastMCP
 
-# Import PySpice for circuit simulation
-from PySpice.Spice.Netlist import Circuit as SpiceCircuit
-from PySpice.Spice.NgSpice.Shared import NgSpiceShared
-from PySpice.Unit import *
-
-# Import SchemDraw for schematic drawing
-import matplotlib
-matplotlib.use('Agg')  # Use non-GUI backend for matplotlib
-import schemdraw
-import schemdraw.elements as elm
-
-from .circuit import Circuit
+# PySpice and schemdraw are imported lazily by Circuit.simulate and
+# Circuit.draw_schematic; nothing here touches them directly
+from .manager import CircuitManager
 
 # Configure logging
 logging.basicConfig(
@@ -35,13 +27,19 @@ logger = logging.getLogger(__name__)
 # Create an MCP server with a descriptive name
 mcp = FastMCP("Circuit Simulation MCP Server")
 
-# In-memory storage for circuits
-# In a production environment, you might want to use a database
-circuits = {}
-next_circuit_id = 1
+# Circuits live in CircuitManager, the same store the HTTP API uses, so
+# both front ends see one set of circuits and persistence (when enabled)
+# applies uniformly
+
+# Output directory for schematics, created once at import; handlers
+# join onto the cached Path instead of re-stating the directory per call
+SCHEMATIC_DIR = Path("schematics")
+SCHEMATIC_DIR.mkdir(exist_ok=True)
 
-# Create output directory for schematics
-os.makedirs("schematics", exist_ok=True)
+# Rendered schematics keyed by (circuit_id, version, format): rendering
+# costs tens of ms to seconds, so a repeat request for an unchanged
+# circuit returns the file already on disk instead of redrawing it
+_schematic_cache: Dict[tuple, str] = {}
 
 # MCP Tools: Functions that perform actions
 
@@ -57,24 +55,7 @@ def create_circuit(name: Optional[str] = None, components: Optional[List[Dict[st
     Returns:
         Dictionary with circuit details
     """
-    global next_circuit_id
-    
-    circuit = Circuit(circuit_id=next_circuit_id, name=name)
-    
-    # Add initial components if provided
-    if components:
-        for comp in components:
-            circuit.add_component(
-                comp["type"],
-                comp["nodes"],
-                comp.get("value"),
-                comp.get("parameters")
-            )
-            
-    # Store the circuit
-    circuits[next_circuit_id] = circuit
-    next_circuit_id += 1
-    
+    circuit = CircuitManager.create_circuit(name=name, components=components)
     return circuit.to_dict()
 
 @mcp.tool()
@@ -98,11 +79,10 @@ def add_component(
     Returns:
         Updated circuit details
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-    
-    circuit = circuits[circuit_id]
-    
+
     # Add the component
     circuit.add_component(
         component_type,
@@ -113,6 +93,28 @@ def add_component(
     
     return circuit.to_dict()
 
+@mcp.tool()
+def add_components(circuit_id: int, components: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Add a batch of components to an existing circuit in one call.
+
+    Args:
+        circuit_id: ID of the circuit to modify
+        components: Component dicts with "type", "nodes" and optional
+            "value"/"parameters" keys
+
+    Returns:
+        Updated circuit details or error
+    """
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
+        return {"error": f"Circuit {circuit_id} not found"}
+
+    # One bulk insert (and one version bump) for the whole batch
+    circuit.bulk_add_components(components)
+
+    return circuit.to_dict()
+
 @mcp.tool()
 def remove_component(circuit_id: int, component_name: str) -> Dict[str, Any]:
     """
@@ -125,10 +127,10 @@ def remove_component(circuit_id: int, component_name: str) -> Dict[str, Any]:
     Returns:
         Updated circuit details or error
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-    
-    circuit = circuits[circuit_id]
+
     removed = circuit.remove_component(component_name)
     
     if not removed:
@@ -153,19 +155,10 @@ def update_circuit(
     Returns:
         Updated circuit details or error
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.update_circuit(circuit_id, name=name, components=components)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-        
-    circuit = circuits[circuit_id]
-    
-    # Update name if provided
-    if name is not None:
-        circuit.name = name
-        
-    # Update components if provided
-    if components is not None:
-        circuit.update_components(components)
-        
+
     return circuit.to_dict()
 
 @mcp.tool()
@@ -185,11 +178,10 @@ def simulate_circuit(
     Returns:
         Simulation results (node voltages, branch currents, etc.)
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-    
-    circuit = circuits[circuit_id]
-    
+
     try:
         # Run the simulation using the Circuit object's simulate method
         result = circuit.simulate(
@@ -215,23 +207,34 @@ def generate_schematic(circuit_id: int, format: str = "png") -> Dict[str, Any]:
     Returns:
         Dictionary with filepath to the generated image
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-    
+
     # Validate format
     format = format.lower()
     if format not in ("png", "svg"):
         return {"error": "Format must be 'png' or 'svg'"}
-    
-    circuit = circuits[circuit_id]
-    
+
+    # Reuse the file rendered for this exact circuit state if it is
+    # still on disk; any edit bumps the revision and forces a redraw
+    cache_key = (circuit_id, circuit.revision, format)
+    cached_path = _schematic_cache.get(cache_key)
+    if cached_path is not None and os.path.exists(cached_path):
+        return {
+            "filepath": cached_path,
+            "message": f"Schematic generated for circuit {circuit_id} (version {circuit.version})"
+        }
+
     # Define output filepath
-    filepath = f"schematics/circuit_{circuit_id}_v{circuit.version}.{format}"
-    
+    filepath = str(SCHEMATIC_DIR / f"circuit_{circuit_id}_v{circuit.version}.{format}")
+
     try:
         # Generate schematic using the Circuit object's draw_schematic method
         circuit.draw_schematic(filepath)
-        
+
+        _schematic_cache[cache_key] = filepath
+
         return {
             "filepath": filepath,
             "message": f"Schematic generated for circuit {circuit_id} (version {circuit.version})"
@@ -240,6 +243,36 @@ def generate_schematic(circuit_id: int, format: str = "png") -> Dict[str, Any]:
         logger.exception(f"Image generation error: {str(e)}")
         return {"error": f"Failed to generate image: {str(e)}"}
 
+@mcp.tool()
+def generate_schematic_bytes(circuit_id: int, format: str = "png") -> Dict[str, Any]:
+    """
+    Generate a schematic and return the raw image bytes.
+
+    Unlike generate_schematic, the client gets the image itself rather
+    than a server-side filepath, so it never has to share a filesystem
+    with the server. The bytes ride outside any JSON body (in process
+    they are passed by reference), avoiding base64 inflation.
+
+    Args:
+        circuit_id: ID of the circuit to visualize
+        format: Image format (png or svg)
+
+    Returns:
+        Dictionary with mime type, size and raw image bytes, or error
+    """
+    result = generate_schematic(circuit_id, format)
+    if "error" in result:
+        return result
+
+    with open(result["filepath"], "rb") as f:
+        data = f.read()
+
+    return {
+        "mime": "image/png" if format.lower() == "png" else "image/svg+xml",
+        "nbytes": len(data),
+        "data": data,
+    }
+
 @mcp.tool()
 def add_uvx_component(
     circuit_id: int,
@@ -259,11 +292,10 @@ def add_uvx_component(
     Returns:
         Updated circuit details or error
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-    
-    circuit = circuits[circuit_id]
-    
+
     # Create parameters dict with uvx_type
     uvx_params = {
         "uvx_type": uvx_type,
@@ -289,12 +321,9 @@ def delete_circuit(circuit_id: int) -> Dict[str, Any]:
     Returns:
         Success message or error
     """
-    if circuit_id not in circuits:
+    if not CircuitManager.delete_circuit(circuit_id):
         return {"error": f"Circuit {circuit_id} not found"}
-    
-    # Delete the circuit
-    del circuits[circuit_id]
-    
+
     return {"message": f"Circuit {circuit_id} deleted successfully"}
 
 # MCP Resources: Data sources that can be read
@@ -307,15 +336,9 @@ def list_circuits() -> List[Dict[str, Any]]:
     Returns:
         List of circuit summary information
     """
-    return [
-        {
-            "id": circuit.id,
-            "name": circuit.name,
-            "version": circuit.version,
-            "components_count": len(circuit.components)
-        }
-        for circuit in circuits.values()
-    ]
+    # Prebuilt rows from the manager; rebuilt only when some circuit
+    # actually changed
+    return CircuitManager.get_summaries()
 
 @mcp.resource("circuit/{circuit_id}")
 def get_circuit_details(circuit_id: int) -> Dict[str, Any]:
@@ -328,10 +351,10 @@ def get_circuit_details(circuit_id: int) -> Dict[str, Any]:
     Returns:
         Complete circuit details or error
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-        
-    circuit = circuits[circuit_id]
+
     return circuit.to_dict()
 
 @mcp.resource("circuit/{circuit_id}/versions")
@@ -345,11 +368,10 @@ def get_circuit_versions(circuit_id: int) -> Dict[str, Any]:
     Returns:
         List of available versions or error
     """
-    if circuit_id not in circuits:
+    circuit = CircuitManager.get_circuit(circuit_id)
+    if circuit is None:
         return {"error": f"Circuit {circuit_id} not found"}
-        
-    circuit = circuits[circuit_id]
-    
+
     # Collect all versions (history + current)
     versions = [record["version"] for record in circuit.history]
     versions.append(circuit.version)  # Add current version
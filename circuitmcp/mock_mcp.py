@@ -3,20 +3,84 @@ Mock implementation of the MCP SDK for testing purposes.
 """
 
 import inspect
-import functools
 from typing import Any, Dict, List, Callable, Optional, Set, Union
 
 
+def _to_int(value):
+    """Convert a path segment to int, passing it through unchanged if it isn't one."""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+class _HandlerSpec:
+    """
+    Signature metadata for a registered handler.
+
+    A __slots__ class instead of a tuple/dict record: no per-instance
+    __dict__, and dispatch reads named fields directly.
+    """
+
+    __slots__ = ("param_names", "allowed", "required", "converters")
+
+    def __init__(self, param_names, required, converters):
+        self.param_names = param_names
+        self.allowed = frozenset(param_names)
+        self.required = required
+        self.converters = converters
+
+
 class FastMCP:
     """
     Mock implementation of the FastMCP class from the MCP SDK.
     """
-    
+
+    # "run" is a slot as well: mcp_server replaces the stock run method
+    # with its own on the instance
+    __slots__ = ("name", "tools", "resources", "prompts", "run",
+                 "_resource_trie", "_tool_specs", "_resource_specs")
+
     def __init__(self, name: str):
         self.name = name
         self.tools = {}
         self.resources = {}
         self.prompts = {}
+
+        # Resource paths compiled into a segment trie at registration so
+        # lookups walk one dict per segment instead of re-splitting every
+        # registered path per request.  "{param}" segments live under the
+        # wildcard key "*", which also records the parameter name.
+        self._resource_trie = {}
+
+        # Signature metadata (param names, required params, int-annotated
+        # params) reflected once at registration; dispatch never calls
+        # inspect.signature again.
+        self._tool_specs = {}
+        self._resource_specs = {}
+
+        # Bound per instance (a slot, not a method) so servers can swap
+        # in their own run implementation, as mcp_server does
+        self.run = self._default_run
+
+    @staticmethod
+    def _inspect_spec(func) -> _HandlerSpec:
+        """Reflect a handler's signature into a plain lookup record."""
+        sig = inspect.signature(func)
+        return _HandlerSpec(
+            param_names=tuple(sig.parameters),
+            required=frozenset(
+                name for name, param in sig.parameters.items()
+                if param.default is inspect.Parameter.empty
+            ),
+            # One converter per parameter, resolved from the annotation
+            # here so dispatch just calls it (str is an identity pass
+            # for path segments, which are already strings)
+            converters={
+                name: _to_int if param.annotation is int else str
+                for name, param in sig.parameters.items()
+            },
+        )
     
     def tool(self, name: Optional[str] = None):
         """Decorator to register a tool function."""
@@ -25,22 +89,29 @@ class FastMCP:
             if name is None:
                 name = func.__name__
             self.tools[name] = func
-            
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
-            return wrapper
+            self._tool_specs[name] = self._inspect_spec(func)
+
+            # Registration is the decorator's only job; returning func
+            # itself avoids a forwarding frame on every direct call
+            return func
         return decorator
     
     def resource(self, path: str):
         """Decorator to register a resource function."""
         def decorator(func):
             self.resources[path] = func
-            
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
-            return wrapper
+            self._resource_specs[func] = self._inspect_spec(func)
+
+            # Insert the path into the lookup trie
+            node = self._resource_trie
+            for part in path.split("/"):
+                if part.startswith("{") and part.endswith("}"):
+                    node = node.setdefault("*", {"__param__": part[1:-1]})
+                else:
+                    node = node.setdefault(part, {})
+            node["__func__"] = func
+
+            return func
         return decorator
     
     def prompt(self, name: Optional[str] = None):
@@ -50,14 +121,11 @@ class FastMCP:
             if name is None:
                 name = func.__name__
             self.prompts[name] = func
-            
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
-            return wrapper
+
+            return func
         return decorator
     
-    def run(self):
+    def _default_run(self):
         """
         Mock method to run the server.
         In a real implementation, this would start the server.
@@ -81,18 +149,18 @@ class FastMCP:
         """
         if name not in self.tools:
             raise ValueError(f"Tool '{name}' not found")
-        
-        # Get the function signature
-        sig = inspect.signature(self.tools[name])
-        
-        # Match parameters to function signature
-        kwargs = {}
-        for param_name, param in sig.parameters.items():
-            if param_name in params:
-                kwargs[param_name] = params[param_name]
-            elif param.default == inspect.Parameter.empty:
-                raise ValueError(f"Missing required parameter '{param_name}' for tool '{name}'")
-        
+
+        # Build kwargs from what the caller actually sent, rather than
+        # walking the full signature: callers typically pass a small dict
+        # while tools declare many optional parameters.  Required-param
+        # validation is one set difference in C.
+        spec = self._tool_specs[name]
+        kwargs = {k: v for k, v in params.items() if k in spec.allowed}
+        missing = spec.required - kwargs.keys()
+        if missing:
+            param_name = min(missing)
+            raise ValueError(f"Missing required parameter '{param_name}' for tool '{name}'")
+
         # Call the function
         return self.tools[name](**kwargs)
     
@@ -108,55 +176,32 @@ class FastMCP:
         Returns:
             Result of the resource
         """
-        # Find matching resource
-        resource_func = None
+        # Walk the trie one segment at a time; literal segments win over
+        # the "*" wildcard edge, which captures a path parameter
+        node = self._resource_trie
         path_params = {}
-        
-        for resource_path, func in self.resources.items():
-            # Check if path is a direct match
-            if resource_path == path:
-                resource_func = func
-                break
-            
-            # Check if path matches a parameterized resource path
-            # For example, "circuit/{circuit_id}" would match "circuit/1"
-            parts = resource_path.split("/")
-            path_parts = path.split("/")
-            
-            if len(parts) == len(path_parts):
-                match = True
-                for i, part in enumerate(parts):
-                    if part.startswith("{") and part.endswith("}"):
-                        # This is a path parameter
-                        param_name = part[1:-1]
-                        path_params[param_name] = path_parts[i]
-                    elif part != path_parts[i]:
-                        match = False
-                        break
-                
-                if match:
-                    resource_func = func
-                    break
-        
+
+        for part in path.split("/"):
+            child = node.get(part)
+            if child is None:
+                child = node.get("*")
+                if child is None:
+                    raise ValueError(f"Resource '{path}' not found")
+                path_params[child["__param__"]] = part
+            node = child
+
+        resource_func = node.get("__func__")
         if resource_func is None:
             raise ValueError(f"Resource '{path}' not found")
         
-        # Get the function signature
-        sig = inspect.signature(resource_func)
-        
-        # Match parameters to function signature
+        # Match parameters against the signature reflected at registration
+        spec = self._resource_specs[resource_func]
         kwargs = {}
-        
-        # First, add path parameters
+
+        # First, add path parameters through the converters resolved at
+        # registration (no annotation checks on the hot path)
         for param_name, param_value in path_params.items():
-            # Try to convert to int if parameter is annotated as int
-            if param_name in sig.parameters and sig.parameters[param_name].annotation == int:
-                try:
-                    kwargs[param_name] = int(param_value)
-                except ValueError:
-                    kwargs[param_name] = param_value
-            else:
-                kwargs[param_name] = param_value
+            kwargs[param_name] = spec.converters[param_name](param_value)
         
         # Then, add query parameters if provided
         if params:
@@ -188,7 +233,9 @@ class ClientSession:
     """
     Mock implementation of the ClientSession class from the MCP SDK.
     """
-    
+
+    __slots__ = ("server",)
+
     def __init__(self, server):
         self.server = server
     
@@ -204,7 +251,37 @@ class ClientSession:
             Result of the tool call
         """
         return self.server.call_tool(name, params)
-    
+
+    def bind_tool(self, name: str) -> Callable:
+        """
+        Pre-resolve a tool into a direct async callable.
+
+        The handler and its signature spec are looked up once here, so
+        callers that invoke the same tool repeatedly skip the per-call
+        name lookup in call_tool.
+
+        Args:
+            name: Name of the tool to bind
+
+        Returns:
+            Async callable taking the tool's parameter dict
+        """
+        server = self.server
+        if name not in server.tools:
+            raise ValueError(f"Tool '{name}' not found")
+        func = server.tools[name]
+        spec = server._tool_specs[name]
+
+        async def bound(params: Dict[str, Any]) -> Any:
+            kwargs = {k: v for k, v in params.items() if k in spec.allowed}
+            missing = spec.required - kwargs.keys()
+            if missing:
+                param_name = min(missing)
+                raise ValueError(f"Missing required parameter '{param_name}' for tool '{name}'")
+            return func(**kwargs)
+
+        return bound
+
     async def get_resource(self, path: str, params: Dict[str, Any] = None) -> Any:
         """
         Get a resource by path with the given parameters.
@@ -260,7 +337,9 @@ class StdioServerParameters:
     """
     Mock implementation of the StdioServerParameters class from the MCP SDK.
     """
-    
+
+    __slots__ = ("command",)
+
     def __init__(self, command: List[str]):
         self.command = command
         
@@ -2,8 +2,8 @@
 Pydantic models for API validation and documentation.
 """
 
-from typing import Dict, List, Optional, Any, Union
-from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Literal, Optional, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 class ComponentParameters(BaseModel):
     """Model for component additional parameters."""
@@ -11,6 +11,7 @@ class ComponentParameters(BaseModel):
     # Will store values like frequency for AC sources, model params for transistors, etc.
     model_config = {
         "extra": "allow",  # Allow arbitrary fields based on component type
+        "defer_build": True,  # Compile the validator on first use, not at import
     }
 
 class ComponentSchema(BaseModel):
@@ -31,10 +32,59 @@ class ComponentSchema(BaseModel):
             }
         }
 
+class _ComponentBase(BaseModel):
+    """Fields shared by every typed component variant."""
+    # frozen models skip pydantic's mutation hooks and extra='forbid'
+    # rejects typo'd fields instead of silently Any-validating them
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    nodes: List[str] = Field(..., description="List of node identifiers the component connects")
+    value: Optional[float] = Field(None, description="Component value (depends on type)")
+    parameters: Optional[ComponentParameters] = Field(None, description="Additional parameters for the component")
+    name: Optional[str] = Field(None, description="Optional name override (auto-generated if not provided)")
+
+class Resistor(_ComponentBase):
+    type: Literal["R"]
+
+class Capacitor(_ComponentBase):
+    type: Literal["C"]
+
+class Inductor(_ComponentBase):
+    type: Literal["L"]
+
+class VoltageSource(_ComponentBase):
+    type: Literal["V"]
+
+class CurrentSource(_ComponentBase):
+    type: Literal["I"]
+
+class Diode(_ComponentBase):
+    type: Literal["D"]
+
+class Transistor(_ComponentBase):
+    type: Literal["Q"]
+
+class Mosfet(_ComponentBase):
+    type: Literal["M"]
+
+class Subcircuit(_ComponentBase):
+    type: Literal["X"]
+
+class UVX(_ComponentBase):
+    type: Literal["U"]
+
+# Tagged union over the component variants: pydantic-core dispatches on
+# the "type" literal in O(1) instead of attempting each variant in turn
+Component = Annotated[
+    Union[Resistor, Capacitor, Inductor, VoltageSource, CurrentSource,
+          Diode, Transistor, Mosfet, Subcircuit, UVX],
+    Field(discriminator="type"),
+]
+
 class CircuitCreateRequest(BaseModel):
     """Schema for creating a new circuit."""
     name: Optional[str] = Field(None, description="Optional name for the circuit")
-    components: Optional[List[ComponentSchema]] = Field(None, description="Initial list of components to add")
+    components: Optional[List[Component]] = Field(None, description="Initial list of components to add")
     
     class Config:
         json_schema_extra = {
@@ -116,7 +166,18 @@ class SimulationResponse(BaseModel):
     # Using Any to allow for dict or list depending on analysis type
     nodes_data: Optional[Dict[str, Any]] = Field(None, description="Node voltage data")
     branches_data: Optional[Dict[str, Any]] = Field(None, description="Branch current data")
-    
+
+    # Each analysis type fills only a few of the optional fields above;
+    # dropping the None fields by default keeps sparse results from
+    # serializing (and shipping) a null for every unused field
+    def model_dump(self, **kwargs):
+        kwargs.setdefault("exclude_none", True)
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs):
+        kwargs.setdefault("exclude_none", True)
+        return super().model_dump_json(**kwargs)
+
     class Config:
         json_schema_extra = {
             "examples": [
@@ -142,7 +203,7 @@ class SimulationResponse(BaseModel):
 class UVXComponentSchema(BaseModel):
     """Schema for UVX (Universal Verification X-component) specification."""
     uvx_type: str = Field(..., description="Type of UVX component (opamp, comparator, adc, dac, etc.)")
-    parameters: Optional[Dict[str, Any]] = Field(None, description="Additional parameters for the UVX component")
+    parameters: Optional[ComponentParameters] = Field(None, description="Additional parameters for the UVX component")
     
     class Config:
         json_schema_extra = {
@@ -174,4 +235,8 @@ class CircuitManager(BaseModel):
                 },
                 "next_id": 2
             }
-        } 
\ No newline at end of file
+        } 
+# Compiled once at import: TypeAdapter caches its pydantic-core
+# validator/serializer, so every caller shares one compiled pipeline for
+# whole component lists instead of validating or dumping per component
+COMPONENT_LIST_ADAPTER = TypeAdapter(List[Component])
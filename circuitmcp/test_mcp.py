@@ -50,25 +50,31 @@ async def run_tests():
         circuit_id = circuit["id"]
         logger.info(f"Created circuit {circuit_id}: {circuit['name']}")
         
-        # Test 3: Add components to create an RC filter
-        await session.call_tool("add_component", {"circuit_id": circuit_id, "component_type": "V", "nodes": ["1", "0"], "value": 5.0})
-        await session.call_tool("add_component", {"circuit_id": circuit_id, "component_type": "R", "nodes": ["1", "2"], "value": 1000.0})
-        await session.call_tool("add_component", {"circuit_id": circuit_id, "component_type": "C", "nodes": ["2", "0"], "value": 1e-6})
+        # Test 3: Add components to create an RC filter.  The adds are
+        # independent (each pins its own nodes), so issue them as one
+        # gather batch instead of three serial round trips
+        await asyncio.gather(
+            session.call_tool("add_component", {"circuit_id": circuit_id, "component_type": "V", "nodes": ["1", "0"], "value": 5.0}),
+            session.call_tool("add_component", {"circuit_id": circuit_id, "component_type": "R", "nodes": ["1", "2"], "value": 1000.0}),
+            session.call_tool("add_component", {"circuit_id": circuit_id, "component_type": "C", "nodes": ["2", "0"], "value": 1e-6}),
+        )
         logger.info("Added components to create RC filter")
         
         # Test 4: Get circuit details
         details = await session.get_resource(f"circuit/{circuit_id}")
         logger.info(f"Circuit has {len(details['components'])} components")
         
-        # Test 5: Run a simulation
-        result = await session.call_tool("simulate_circuit", {"circuit_id": circuit_id, "analysis": "operating_point"})
+        # Tests 5 and 6: simulation and schematic generation are
+        # independent reads of the same circuit, so overlap them
+        result, schematic = await asyncio.gather(
+            session.call_tool("simulate_circuit", {"circuit_id": circuit_id, "analysis": "operating_point"}),
+            session.call_tool("generate_schematic", {"circuit_id": circuit_id}),
+        )
         if "error" in result:
             logger.error(f"Simulation failed: {result['error']}")
         else:
             logger.info(f"Simulation successful, node voltages: {result.get('nodes', {})}")
-        
-        # Test 6: Generate a schematic
-        schematic = await session.call_tool("generate_schematic", {"circuit_id": circuit_id})
+
         if "error" in schematic:
             logger.error(f"Schematic generation failed: {schematic['error']}")
         else:
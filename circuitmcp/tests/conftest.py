@@ -0,0 +1,21 @@
+"""
+Shared test configuration.
+"""
+
+import httpx
+import orjson
+
+# Decode response bodies with orjson instead of stdlib json: the tests
+# call response.json() on every assertion, and orjson parses the
+# numeric-heavy payloads (simulation traces, component lists) several
+# times faster.  Calls passing stdlib json kwargs fall through.
+_stdlib_json = httpx.Response.json
+
+
+def _orjson_json(self, **kwargs):
+    if kwargs:
+        return _stdlib_json(self, **kwargs)
+    return orjson.loads(self.content)
+
+
+httpx.Response.json = _orjson_json
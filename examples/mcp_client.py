@@ -7,13 +7,31 @@ and interact with the Circuit Simulation MCP Server.
 """
 
 import asyncio
+from collections import OrderedDict
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 import os
 import sys
-import json
+
+try:
+    import orjson
+
+    def _pp(obj) -> str:
+        """Pretty-print via orjson's C encoder."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:  # pragma: no cover - orjson ships with the server deps
+    import json
+
+    def _pp(obj) -> str:
+        """Pretty-print via stdlib json."""
+        return json.dumps(obj, indent=2)
+
+# Resolve the package root once at import; connect() reuses it
+_PKG_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SERVER_SCRIPT = os.path.join(_PKG_ROOT, "circuitmcp", "mcp_server.py")
 
 # Add parent directory to path to import Circuit Simulation MCP Server
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, _PKG_ROOT)
 
 # Import our mock implementation of the MCP SDK
 from circuitmcp.mock_mcp import ClientSession, StdioServerParameters, AsyncExitStack
@@ -21,19 +39,47 @@ from circuitmcp.mock_mcp import ClientSession, StdioServerParameters, AsyncExitS
 class CircuitMCPClient:
     """MCP client for interacting with the Circuit Simulation MCP Server"""
     
-    def __init__(self):
+    # Most entries a tweak-and-rerun session produces are stale versions
+    # of the same few circuits, so a small LRU is plenty
+    _SIM_CACHE_SIZE = 128
+
+    def __init__(self, in_process: bool = True):
         self.session = None
         self.exit_stack = None
-        
+        self.in_process = in_process
+        # Simulation results keyed by (circuit id, version, analysis,
+        # params); the version in the key makes edits self-invalidating
+        self._sim_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
     async def connect(self):
         """Connect to the circuit simulation MCP server"""
-        server_script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                                     "circuitmcp", "mcp_server.py")
-        
         self.exit_stack = AsyncExitStack()
-        self.session = await self.exit_stack.enter_async_context(
-            ClientSession(StdioServerParameters(["python", server_script]))
-        )
+
+        if self.in_process:
+            # Client and server run on the same host here, so talk to the
+            # server object directly: tool calls become plain async method
+            # dispatch with arguments passed by reference -- no subprocess
+            # spawn, no JSON encode/decode, no pipe copies
+            from circuitmcp import mcp
+            self.session = await self.exit_stack.enter_async_context(
+                ClientSession(mcp)
+            )
+        else:
+            self.session = await self.exit_stack.enter_async_context(
+                ClientSession(StdioServerParameters(["python", _SERVER_SCRIPT]))
+            )
+
+        # Tool names never change within a session, so resolve each one
+        # to its handler now instead of by string on every call
+        bind = self.session.bind_tool
+        self._create_circuit = bind("create_circuit")
+        self._add_component = bind("add_component")
+        self._add_components = bind("add_components")
+        self._add_uvx_component = bind("add_uvx_component")
+        self._simulate_circuit = bind("simulate_circuit")
+        self._generate_schematic = bind("generate_schematic")
+        self._generate_schematic_bytes = bind("generate_schematic_bytes")
+
         print("Connected to Circuit Simulation MCP Server")
         
     async def close(self):
@@ -42,71 +88,38 @@ class CircuitMCPClient:
             await self.exit_stack.aclose()
             print("Disconnected from Circuit Simulation MCP Server")
     
-    async def create_circuit(self, name: Optional[str] = None, 
-                            components: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
-        """Create a new circuit"""
-        params = {}
-        if name:
-            params["name"] = name
-        if components:
-            params["components"] = components
-            
-        result = await self.session.call_tool("create_circuit", params)
-        return result
-    
-    async def add_component(self, circuit_id: int, component_type: str, nodes: List[str], 
-                           value: Optional[float] = None, 
-                           parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Add a component to an existing circuit"""
-        params = {
-            "circuit_id": circuit_id,
-            "component_type": component_type,
-            "nodes": nodes
-        }
-        
-        if value is not None:
-            params["value"] = value
-        if parameters:
-            params["parameters"] = parameters
-            
-        result = await self.session.call_tool("add_component", params)
-        return result
-    
-    async def add_uvx_component(self, circuit_id: int, nodes: List[str], uvx_type: str,
-                               parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Add a UVX component to a circuit"""
-        params = {
-            "circuit_id": circuit_id,
-            "nodes": nodes,
-            "uvx_type": uvx_type
-        }
-        
-        if parameters:
-            params["parameters"] = parameters
-            
-        result = await self.session.call_tool("add_uvx_component", params)
-        return result
-    
+    # create_circuit, add_component, add_components, add_uvx_component
+    # and generate_schematic are generated from _TOOL_METHOD_SPECS below
+
     async def simulate(self, circuit_id: int, analysis: str = "operating_point",
                       params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Run a simulation on a circuit"""
+        """Run a simulation on a circuit (memoized per circuit version)"""
+        # The circuit's version bumps on every edit, so keying the cache
+        # by it lets repeated simulate calls on an unchanged circuit skip
+        # the solver entirely without any explicit invalidation
+        details = await self.get_circuit_details(circuit_id)
+        key = (circuit_id, details.get("version"), analysis,
+               tuple(sorted(params.items())) if params else None)
+        cached = self._sim_cache.get(key)
+        if cached is not None:
+            self._sim_cache.move_to_end(key)
+            return cached
+
         sim_params = {
             "circuit_id": circuit_id,
             "analysis": analysis
         }
-        
+
         if params:
             sim_params["params"] = params
-            
-        result = await self.session.call_tool("simulate_circuit", sim_params)
-        return result
-    
-    async def generate_schematic(self, circuit_id: int, format: str = "png") -> Dict[str, Any]:
-        """Generate a schematic image of the circuit"""
-        result = await self.session.call_tool("generate_schematic", {
-            "circuit_id": circuit_id,
-            "format": format
-        })
+
+        result = await self._simulate_circuit(sim_params)
+
+        # Cache only successful solves; errors should re-run
+        if isinstance(result, dict) and "error" not in result:
+            self._sim_cache[key] = result
+            if len(self._sim_cache) > self._SIM_CACHE_SIZE:
+                self._sim_cache.popitem(last=False)
         return result
     
     async def get_all_circuits(self) -> List[Dict[str, Any]]:
@@ -118,98 +131,160 @@ class CircuitMCPClient:
         return await self.session.get_resource(f"circuit/{circuit_id}")
 
 
-async def create_rc_filter():
+# The plain tool wrappers all follow the same shape -- pack the required
+# params into a dict, append the optional ones that were given, await the
+# bound tool -- so they are generated from one table instead of written
+# by hand five times.  Each spec is (tool_name, docstring, params) where
+# a param is (name, default_source, required); required params are always
+# packed, optional ones only when not None.
+_TOOL_METHOD_SPECS = [
+    ("create_circuit", "Create a new circuit", [
+        ("name", "None", False),
+        ("components", "None", False),
+    ]),
+    ("add_component", "Add a component to an existing circuit", [
+        ("circuit_id", None, True),
+        ("component_type", None, True),
+        ("nodes", None, True),
+        ("value", "None", False),
+        ("parameters", "None", False),
+    ]),
+    ("add_components", "Add a batch of components to a circuit in one round trip", [
+        ("circuit_id", None, True),
+        ("components", None, True),
+    ]),
+    ("add_uvx_component", "Add a UVX component to a circuit", [
+        ("circuit_id", None, True),
+        ("nodes", None, True),
+        ("uvx_type", None, True),
+        ("parameters", "None", False),
+    ]),
+    ("generate_schematic", "Generate a schematic image of the circuit", [
+        ("circuit_id", None, True),
+        ("format", '"png"', True),
+    ]),
+    ("generate_schematic_bytes", "Fetch the schematic as raw image bytes", [
+        ("circuit_id", None, True),
+        ("format", '"png"', True),
+    ]),
+]
+
+
+def _install_tool_methods(cls):
+    """Compile one flat wrapper method per spec onto the client class."""
+    for tool, doc, params in _TOOL_METHOD_SPECS:
+        args = ", ".join(
+            name if default is None else f"{name}={default}"
+            for name, default, _ in params
+        )
+        packed = ", ".join(f'"{name}": {name}' for name, _, req in params if req)
+        lines = [
+            f"async def {tool}(self, {args}):",
+            f'    """{doc}"""',
+            f"    params = {{{packed}}}",
+        ]
+        for name, _, req in params:
+            if not req:
+                lines.append(f"    if {name} is not None:")
+                lines.append(f'        params["{name}"] = {name}')
+        lines.append(f"    return await self._{tool}(params)")
+        namespace = {}
+        exec(compile("\n".join(lines), f"<tool {tool}>", "exec"), namespace)
+        setattr(cls, tool, namespace[tool])
+
+
+_install_tool_methods(CircuitMCPClient)
+
+
+async def create_rc_filter(client: CircuitMCPClient):
     """Example creating an RC filter circuit and running simulation"""
-    client = CircuitMCPClient()
-    
-    try:
-        await client.connect()
-        
-        # Create a new circuit
-        circuit = await client.create_circuit("RC Low-Pass Filter")
-        circuit_id = circuit["id"]
-        print(f"Created circuit {circuit_id}: {circuit['name']}")
-        
-        # Add a 5V voltage source
-        await client.add_component(circuit_id, "V", ["1", "0"], 5.0)
-        print("Added voltage source V1")
-        
-        # Add a 1kΩ resistor
-        await client.add_component(circuit_id, "R", ["1", "2"], 1000.0)
-        print("Added resistor R1")
-        
-        # Add a 1µF capacitor
-        await client.add_component(circuit_id, "C", ["2", "0"], 1e-6)
-        print("Added capacitor C1")
-        
-        # Run an operating point analysis
-        result = await client.simulate(circuit_id)
-        print("\nSimulation results:")
-        print(json.dumps(result, indent=2))
-        
-        # Generate a schematic
-        schematic = await client.generate_schematic(circuit_id)
-        print(f"\nSchematic generated: {schematic['filepath']}")
-        
-    finally:
-        await client.close()
+    # Create a new circuit
+    circuit = await client.create_circuit("RC Low-Pass Filter")
+    circuit_id = circuit["id"]
+    print(f"Created circuit {circuit_id}: {circuit['name']}")
+
+    # Add the source, resistor and capacitor in one batched call
+    await client.add_components(circuit_id, [
+        {"type": "V", "nodes": ["1", "0"], "value": 5.0},   # 5V source
+        {"type": "R", "nodes": ["1", "2"], "value": 1000.0},  # 1kΩ resistor
+        {"type": "C", "nodes": ["2", "0"], "value": 1e-6},  # 1µF capacitor
+    ])
+    print("Added voltage source V1, resistor R1 and capacitor C1")
+
+    # Run an operating point analysis
+    result = await client.simulate(circuit_id)
+    print("\nSimulation results:")
+    print(_pp(result))
+
+    # Generate a schematic
+    schematic = await client.generate_schematic(circuit_id)
+
+    # Read the rendered PNG off-thread so the op-amp scenario's RPCs
+    # keep running while this coroutine waits on the disk
+    data = await asyncio.to_thread(Path(schematic["filepath"]).read_bytes)
+    print(f"\nSchematic generated: {schematic['filepath']} ({len(data)} bytes)")
 
 
-async def create_opamp_circuit():
+async def create_opamp_circuit(client: CircuitMCPClient):
     """Example creating an op-amp circuit using UVX component"""
+    # Create a new circuit
+    circuit = await client.create_circuit("Non-inverting Op-Amp")
+    circuit_id = circuit["id"]
+    print(f"Created circuit {circuit_id}: {circuit['name']}")
+
+    # Add supplies, input source and feedback resistors as one batch
+    await client.add_components(circuit_id, [
+        {"type": "V", "nodes": ["vcc", "0"], "value": 15.0},
+        {"type": "V", "nodes": ["0", "vee"], "value": 15.0},
+        {"type": "V", "nodes": ["in", "0"], "value": 1.0},
+        {"type": "R", "nodes": ["out", "fb"], "value": 10000.0},  # R1 (10kΩ)
+        {"type": "R", "nodes": ["fb", "0"], "value": 1000.0},     # R2 (1kΩ)
+    ])
+    print("Added power supplies, input voltage source and feedback resistors")
+
+    # Add op-amp UVX component
+    await client.add_uvx_component(
+        circuit_id,
+        ["out", "fb", "in", "vcc", "vee"],  # Output, -, +, V+, V-
+        "opamp",
+        {
+            "model": "ideal",
+            "gain": 1000000.0
+        }
+    )
+    print("Added op-amp UVX component")
+
+    # Run an operating point analysis
+    result = await client.simulate(circuit_id)
+    print("\nSimulation results:")
+    print(_pp(result))
+
+    # Generate a schematic
+    schematic = await client.generate_schematic(circuit_id)
+    print(f"\nSchematic generated: {schematic['filepath']}")
+
+
+async def main():
+    """Run both scenarios over a single connected session"""
+    print("=== Creating RC Filter and Op-Amp Circuits ===")
     client = CircuitMCPClient()
-    
     try:
         await client.connect()
-        
-        # Create a new circuit
-        circuit = await client.create_circuit("Non-inverting Op-Amp")
-        circuit_id = circuit["id"]
-        print(f"Created circuit {circuit_id}: {circuit['name']}")
-        
-        # Add power supplies
-        await client.add_component(circuit_id, "V", ["vcc", "0"], 15.0)
-        await client.add_component(circuit_id, "V", ["0", "vee"], 15.0)
-        print("Added power supplies")
-        
-        # Add input voltage
-        await client.add_component(circuit_id, "V", ["in", "0"], 1.0)
-        print("Added input voltage source")
-        
-        # Add feedback resistors
-        await client.add_component(circuit_id, "R", ["out", "fb"], 10000.0)  # R1 (10kΩ)
-        await client.add_component(circuit_id, "R", ["fb", "0"], 1000.0)     # R2 (1kΩ)
-        print("Added feedback resistors")
-        
-        # Add op-amp UVX component
-        await client.add_uvx_component(
-            circuit_id, 
-            ["out", "fb", "in", "vcc", "vee"],  # Output, -, +, V+, V-
-            "opamp",
-            {
-                "model": "ideal",
-                "gain": 1000000.0
-            }
+        await asyncio.gather(
+            create_rc_filter(client),
+            create_opamp_circuit(client),
         )
-        print("Added op-amp UVX component")
-        
-        # Run an operating point analysis
-        result = await client.simulate(circuit_id)
-        print("\nSimulation results:")
-        print(json.dumps(result, indent=2))
-        
-        # Generate a schematic
-        schematic = await client.generate_schematic(circuit_id)
-        print(f"\nSchematic generated: {schematic['filepath']}")
-        
     finally:
         await client.close()
 
 
 if __name__ == "__main__":
-    # Create and run an RC filter circuit
-    print("=== Creating RC Filter Circuit ===")
-    asyncio.run(create_rc_filter())
-    
-    print("\n=== Creating Op-Amp Circuit ===")
-    asyncio.run(create_opamp_circuit()) 
\ No newline at end of file
+    # uvloop's C event loop cuts per-await scheduling overhead, which is
+    # most of what this all-RPC workload does; fall back to the stdlib
+    # loop when it isn't installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
@@ -74,5 +74,11 @@ async def create_and_visualize_circuit():
         logger.info("Demo completed successfully!")
 
 if __name__ == "__main__":
+    # Prefer uvloop's C event loop when available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     # Run the demo
-    asyncio.run(create_and_visualize_circuit()) 
\ No newline at end of file
+    asyncio.run(create_and_visualize_circuit())
\ No newline at end of file